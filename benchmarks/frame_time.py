@@ -0,0 +1,289 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+# Frame times of the game loop, driven headless: every frame is an on_update
+# followed by an on_draw, with autoplay dealing round after round. Each case
+# runs in a fresh interpreter with a window of its own, and makes three
+# passes over the same frames: one timed, one with the hot spots wrapped in
+# timers and the draw calls counted, and one with allocations traced, so that
+# neither kind of instrumentation skews the frame times.
+#
+#     python benchmarks/frame_time.py --compare
+#     python benchmarks/frame_time.py --save
+#
+# compare against and save to benchmarks/baseline.json by default. Without a
+# GPU, the frames are drawn by a software renderer and take far longer.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+# name: (num_players, num_decks, extra tweens queued with every round)
+CASES = {
+    "1p-1d": (1, 1, 0),
+    "3p-1d": (3, 1, 0),
+    "5p-6d": (5, 6, 0),
+    "3p-1d-200tw": (3, 1, 200),
+}
+HOT_SPOTS = ["Seat.value_total", "centered_text", "SequenceEasing.on_update"]
+# a metric this much worse than the baseline counts as a regression
+TOLERANCE = 1.25
+
+
+def percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class Game:
+    def __init__(self, num_players: int, num_decks: int, tweens: int):
+        from arcade import easing
+
+        from main import BlackJack
+
+        self.easing = easing
+        self.window = BlackJack(num_players, num_decks, autoplay=True, seed=0)
+        self.tweens = tweens
+        self.window.setup(new_deck=True)
+        self.queue_tweens()
+
+    def queue_tweens(self):
+        # keep the pile busy alongside the first deal of every round
+        deck = self.window.deck
+        if not self.tweens or not deck.pile or not deck.easing_data:
+            return
+        step = deck.easing_data[0]
+        for i in range(self.tweens):
+            card = deck.pile[i % len(deck.pile)]
+            step.add_easing_data(
+                card,
+                "top",
+                self.easing.ease_value(card.top, card.top, time=0.5),
+            )
+
+    def frame(self):
+        window = self.window
+        window.on_update(1 / 60)
+        window.on_draw()
+        window.ctx.finish()
+        if window.round_over and not window.deck.easing_data:
+            window.setup()
+            self.queue_tweens()
+
+
+def wrap(owner, name: str, timings: dict[str, float], key: str):
+    attribute = owner.__dict__[name]
+    if isinstance(attribute, property):
+        func = attribute.fget
+    else:
+        func = attribute
+
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timings[key] += time.perf_counter() - start
+
+    if isinstance(attribute, property):
+        timed = property(timed)
+    setattr(owner, name, timed)
+
+
+def run_case(name: str, frames: int, warmup: int) -> dict:
+    num_players, num_decks, tweens = CASES[name]
+    game = Game(num_players, num_decks, tweens)
+    for _ in range(warmup):
+        game.frame()
+
+    frame_times = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        game.frame()
+        frame_times.append(time.perf_counter() - start)
+
+    from blackjack import seat, utilities
+    from blackjack.instrument import DrawCalls
+
+    timings = dict.fromkeys(HOT_SPOTS, 0.0)
+    wrap(seat.Seat, "value_total", timings, "Seat.value_total")
+    wrap(utilities, "centered_text", timings, "centered_text")
+    wrap(
+        utilities.SequenceEasing,
+        "on_update",
+        timings,
+        "SequenceEasing.on_update",
+    )
+    DrawCalls.install()
+    draw_calls = DrawCalls.read()
+    for _ in range(frames):
+        game.frame()
+    draw_calls = DrawCalls.read() - draw_calls
+
+    tracemalloc.start()
+    peaks = []
+    blocks = sys.getallocatedblocks()
+    for _ in range(frames):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        game.frame()
+        peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    blocks = sys.getallocatedblocks() - blocks
+    tracemalloc.stop()
+
+    result = {
+        "frame_p50_ms": 1000 * percentile(frame_times, 0.5),
+        "frame_p99_ms": 1000 * percentile(frame_times, 0.99),
+        "alloc_peak_kib": percentile(peaks, 0.5) / 1024,
+        "net_blocks_per_frame": blocks / frames,
+        "draw_calls_per_frame": draw_calls / frames,
+    }
+    for key, total in timings.items():
+        result[f"{key}_us"] = 1e6 * total / frames
+    return result
+
+
+def run_micro(repeat: int) -> dict:
+    from blackjack.deck import Deck
+    from blackjack.engine import Shoe
+    from blackjack.seat import Dealer
+    from blackjack.utilities import LabelPool
+    from main import BlackJack
+
+    window = BlackJack(1)
+    width, height = window.get_size()
+    seat = Dealer(width, height, LabelPool(), "dealer", center_x=0, top=0)
+    seat.on_resize(width, height)
+    results = {}
+
+    # there is no Deck.add_deck; refill is what builds up a fresh shoe's pile
+    elapsed = 0.0
+    for _ in range(repeat):
+        deck = Deck(width, height, "red", Shoe(seed=0))
+        deck.on_resize(width, height)
+        start = time.perf_counter()
+        deck.refill()
+        elapsed += time.perf_counter() - start
+    results["Deck.refill_us"] = 1e6 * elapsed / repeat
+
+    shoe = Shoe(seed=0)
+    deck = Deck(width, height, "red", shoe)
+    deck.on_resize(width, height)
+    deck.refill()
+    elapsed = 0.0
+    for i in range(repeat):
+        if shoe.needs_shuffle:
+            shoe.shuffle()
+            deck.easing_data.clear()
+            deck.refill()
+        card = shoe.draw()
+        start = time.perf_counter()
+        deck.deal_card(seat, card)
+        elapsed += time.perf_counter() - start
+    results["Deck.deal_card_us"] = 1e6 * elapsed / repeat
+
+    start = time.perf_counter()
+    for i in range(repeat):
+        deck.on_resize(width - i % 2, height)
+    results["Deck.on_resize_us"] = 1e6 * (time.perf_counter() - start) / repeat
+    return results
+
+
+def run_child(args: argparse.Namespace):
+    os.environ.setdefault("ARCADE_HEADLESS", "1")
+    sys.path.insert(0, ROOT)
+    if args.case == "micro":
+        result = run_micro(args.repeat)
+    else:
+        result = run_case(args.case, args.frames, args.warmup)
+    print(json.dumps(result))
+
+
+def run_suite(args: argparse.Namespace) -> dict[str, dict]:
+    results = {}
+    for name in args.cases:
+        output = subprocess.run(
+            [
+                sys.executable,
+                os.path.abspath(__file__),
+                "--case",
+                name,
+                "--frames",
+                str(args.frames),
+                "--warmup",
+                str(args.warmup),
+                "--repeat",
+                str(args.repeat),
+            ],
+            cwd=ROOT,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        results[name] = json.loads(output.splitlines()[-1])
+    return results
+
+
+def report(results: dict[str, dict], baseline: dict[str, dict]) -> int:
+    regressions = 0
+    for name, metrics in results.items():
+        print(name)
+        for key, value in metrics.items():
+            line = f"  {key:>34}: {value:10.2f}"
+            before = baseline.get(name, {}).get(key)
+            if before:
+                ratio = value / before
+                line += f"  ({ratio:.2f}x baseline)"
+                # only the timings are held to the baseline
+                if key.endswith(("_ms", "_us")) and ratio > TOLERANCE:
+                    line += "  REGRESSION"
+                    regressions += 1
+            print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--warmup", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument(
+        "--save",
+        nargs="?",
+        const=BASELINE,
+        metavar="PATH",
+        help="write a baseline",
+    )
+    parser.add_argument(
+        "--compare",
+        nargs="?",
+        const=BASELINE,
+        metavar="PATH",
+        help="compare against a baseline",
+    )
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    parser.add_argument("cases", nargs="*", default=list(CASES) + ["micro"])
+    args = parser.parse_args()
+    if args.case:
+        run_child(args)
+        return
+
+    results = run_suite(args)
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    regressions = report(results, baseline)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
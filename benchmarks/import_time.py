@@ -0,0 +1,61 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Cold-start cost of the package, measured in fresh interpreters so that
+# nothing is cached between runs. "eager" forces every texture to be decoded,
+# which is what importing the textures used to cost.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = {
+    "engine": "import blackjack.engine",
+    "textures": "import blackjack.textures",
+    "eager": (
+        "from blackjack.textures import CARD_BACKS, CARD_FACES, TABLE\n"
+        "for textures in (CARD_BACKS, CARD_FACES):\n"
+        "    for key in textures:\n"
+        "        textures[key]"
+    ),
+}
+
+TIMER = """
+import time
+start = time.perf_counter()
+{code}
+print(time.perf_counter() - start)
+"""
+
+
+def time_case(code: str, repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", TIMER.format(code=code)],
+            cwd=ROOT,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        timings.append(float(output.split()[-1]))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("cases", nargs="*", default=list(CASES))
+    args = parser.parse_args()
+
+    for name in args.cases:
+        timings = time_case(CASES[name], args.repeat)
+        print(
+            f"{name:>10}: median {1000 * statistics.median(timings):8.1f} ms"
+            f"  (min {1000 * min(timings):.1f} ms, {args.repeat} runs)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,24 @@
+import os
+import struct
+
 import numpy as np
-from .textures import CARD_BACKS
+
+ASSETS = os.path.join(os.path.dirname(__file__), "assets")
+
+
+def _png_size(path: str) -> tuple[int, int]:
+    # the width and height live in the IHDR chunk, right after the signature,
+    # so there is no need to decode the whole image (or import arcade) here
+    with open(path, "rb") as f:
+        header = f.read(24)
+    return struct.unpack(">II", header[16:24])
+
 
 SCREEN_TITLE = "Black Jack"
 SCREEN_SIZE = np.array([1920, 1080])
 SEAT_PADDING = 20
 CARD_SPACING = np.array([26, 76])
 CARD_SCALE = 0.4
-CARD_SIZE = CARD_SCALE * np.array(CARD_BACKS["red"].size)
+CARD_SIZE = CARD_SCALE * np.array(
+    _png_size(os.path.join(ASSETS, "cards/backs/red.png"))
+)
@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+
+import PIL.Image
+
+from . import ASSETS, CARD_SCALE
+from .cache import CACHE_DIR, write_atomic
+
+# All of the card images packed into a single image, so that loading the
+# cards takes one decode rather than one per card. The packed image and its
+# index are cached on disk under a hash of the source assets, and rebuilt
+# whenever one of those changes. The cards are packed at the size they are
+# drawn at, CARD_SCALE of the source images, so the sprites are not scaled
+# down from much larger textures every frame. Build it ahead of time with
+#
+#     python -m blackjack.atlas
+
+ATLAS_VERSION = 2
+ATLAS_COLUMNS = 9
+
+Rect = tuple[int, int, int, int]
+
+
+def card_assets() -> list[str]:
+    # asset paths relative to ASSETS, which double as the keys of the index
+    return sorted(
+        os.path.join("cards", kind, name)
+        for kind in ["backs", "faces"]
+        for name in os.listdir(os.path.join(ASSETS, "cards", kind))
+        if name.endswith(".png")
+    )
+
+
+def asset_hash(assets: list[str]) -> str:
+    digest = hashlib.sha256(f"atlas-v{ATLAS_VERSION}".encode())
+    for asset in assets:
+        digest.update(asset.encode())
+        with open(os.path.join(ASSETS, asset), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def atlas_paths(digest: str, cache_dir: str = CACHE_DIR) -> tuple[str, str]:
+    stem = os.path.join(cache_dir, f"cards-{digest}")
+    return f"{stem}.png", f"{stem}.json"
+
+
+def scaled_size(width: int, height: int) -> tuple[int, int]:
+    return round(width * CARD_SCALE), round(height * CARD_SCALE)
+
+
+def pack_atlas(
+    assets: list[str],
+) -> tuple[PIL.Image.Image, dict[str, Rect]]:
+    images = []
+    for asset in assets:
+        with PIL.Image.open(os.path.join(ASSETS, asset)) as image:
+            image = image.convert("RGBA")
+            images.append(
+                image.resize(scaled_size(*image.size), PIL.Image.LANCZOS)
+            )
+    cell_width = max(image.width for image in images)
+    cell_height = max(image.height for image in images)
+    rows = -(-len(images) // ATLAS_COLUMNS)
+    atlas = PIL.Image.new(
+        "RGBA", (ATLAS_COLUMNS * cell_width, rows * cell_height)
+    )
+
+    index = {}
+    for i, (asset, image) in enumerate(zip(assets, images)):
+        row, column = divmod(i, ATLAS_COLUMNS)
+        left, top = column * cell_width, row * cell_height
+        atlas.paste(image, (left, top))
+        index[asset] = (left, top, image.width, image.height)
+    return atlas, index
+
+
+def save_atlas(
+    atlas: PIL.Image.Image,
+    index: dict[str, Rect],
+    image_path: str,
+    index_path: str,
+):
+    # favour decoding speed over file size
+    write_atomic(
+        image_path, lambda f: atlas.save(f, format="PNG", compress_level=1)
+    )
+    write_atomic(index_path, lambda f: f.write(json.dumps(index).encode()))
+
+
+def load_atlas(
+    cache_dir: str = CACHE_DIR,
+) -> tuple[PIL.Image.Image, dict[str, Rect], str]:
+    assets = card_assets()
+    digest = asset_hash(assets)
+    image_path, index_path = atlas_paths(digest, cache_dir)
+    try:
+        with open(index_path) as f:
+            index = {key: tuple(rect) for key, rect in json.load(f).items()}
+        image = PIL.Image.open(image_path)
+        image.load()
+    except (OSError, ValueError):
+        image, index = pack_atlas(assets)
+        try:
+            save_atlas(image, index, image_path, index_path)
+        except OSError:
+            # the cache is only there to save time; without a writable one,
+            # the atlas is packed again by every process
+            pass
+    return image, index, digest
+
+
+if __name__ == "__main__":
+    assets = card_assets()
+    image_path, index_path = atlas_paths(asset_hash(assets))
+    save_atlas(*pack_atlas(assets), image_path, index_path)
+    print(image_path)
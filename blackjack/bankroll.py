@@ -0,0 +1,198 @@
+from typing import Callable, NamedTuple, Optional, Union
+
+import numpy as np
+
+from .count import HI_LO
+from .engine import CARDS, MAX_DECKS, SUITS, VALUES
+from .simulate import simulate_rounds
+
+# Risk of ruin, found by playing many independent bankrolls side by side as
+# NumPy arrays, one round for all of them at a time. Bets are capped at what
+# is left in the purse, and a bankroll is ruined once the purse is empty,
+# just like a seat whose purse is down to 0 sits out in the game.
+#
+# Bets are sized by a betting scheme from the purses and, when the bankrolls
+# are dealt from shoes of their own rather than the infinite one, the Hi-Lo
+# true count of each shoe.
+
+
+class FlatBet:
+    def __init__(self, bet: int = 100):
+        self.bet = bet
+
+    def __call__(
+        self, purses: np.ndarray, true_counts: np.ndarray
+    ) -> np.ndarray:
+        return np.full_like(purses, self.bet)
+
+
+class ProportionalBet:
+    # a fixed share of what is left, but never less than ``minimum``
+    def __init__(self, fraction: float = 0.1, minimum: int = 1):
+        if not 0.0 < fraction <= 1.0:
+            raise ValueError("fraction must be in (0, 1]")
+        self.fraction = fraction
+        self.minimum = minimum
+
+    def __call__(
+        self, purses: np.ndarray, true_counts: np.ndarray
+    ) -> np.ndarray:
+        bets = np.floor(purses * self.fraction).astype(purses.dtype)
+        return np.maximum(bets, self.minimum)
+
+
+class CountBet:
+    # one ``unit`` up to a true count of 1, then a unit more for every true
+    # count above that, up to ``max_units``
+    counts_cards = True
+
+    def __init__(self, unit: int = 100, max_units: int = 8):
+        self.unit = unit
+        self.max_units = max_units
+
+    def __call__(
+        self, purses: np.ndarray, true_counts: np.ndarray
+    ) -> np.ndarray:
+        units = np.clip(np.floor(true_counts), 1, self.max_units)
+        return self.unit * units.astype(purses.dtype)
+
+
+BetScheme = Union[FlatBet, ProportionalBet, CountBet]
+
+
+class Shoes:
+    # a shuffled shoe for every bankroll, as ranks, each with its own deal
+    # position and running count
+    def __init__(
+        self,
+        num_shoes: int,
+        num_decks: int = 1,
+        penetration: float = 0.75,
+        rng: Optional[np.random.Generator] = None,
+    ):
+        if not 1 <= num_decks <= MAX_DECKS:
+            raise ValueError(f"num_decks must be between 1 and {MAX_DECKS}")
+        if not 0.0 < penetration <= 1.0:
+            raise ValueError("penetration must be in (0, 1]")
+        self.rng = np.random.default_rng() if rng is None else rng
+        self.num_decks = num_decks
+        deck = np.repeat(np.array(VALUES, np.int8), len(SUITS))
+        self.order = np.tile(deck, (num_shoes, num_decks))
+        self.cut = int(penetration * self.order.shape[1])
+        self.position = np.zeros(num_shoes, np.intp)
+        self.running_count = np.zeros(num_shoes, np.int32)
+        self.tags = np.array((0,) + HI_LO, np.int32)  # indexed by rank
+        self.shuffle(np.arange(num_shoes))
+
+    def shuffle(self, rows: np.ndarray):
+        self.order[rows] = self.rng.permuted(self.order[rows], axis=1)
+        self.position[rows] = 0
+        self.running_count[rows] = 0
+
+    def shuffle_if_needed(self):
+        rows = np.flatnonzero(self.position >= self.cut)
+        if rows.size:
+            self.shuffle(rows)
+
+    def true_counts(self, rows: np.ndarray) -> np.ndarray:
+        remaining = self.order.shape[1] - self.position[rows]
+        decks = np.maximum(remaining / len(CARDS), 0.5)
+        return self.running_count[rows] / decks
+
+    def draw(self, rows: np.ndarray) -> np.ndarray:
+        # only a fully dealt shoe gets shuffled mid-round
+        empty = rows[self.position[rows] >= self.order.shape[1]]
+        if empty.size:
+            self.shuffle(empty)
+        ranks = self.order[rows, self.position[rows]]
+        self.position[rows] += 1
+        self.running_count[rows] += self.tags[ranks]
+        return ranks
+
+    def dealer(self, rows: np.ndarray) -> Callable[[np.ndarray], np.ndarray]:
+        # a ``draw`` for ``simulate_rounds``, whose i-th round is dealt from
+        # the shoe in ``rows[i]``
+        return lambda i: self.draw(rows[i])
+
+
+class BankrollResults(NamedTuple):
+    purses: np.ndarray  # at the end, or when ruined
+    ruin_rounds: np.ndarray  # rounds played before ruin, -1 if never ruined
+    max_drawdowns: np.ndarray  # largest fall from a previous peak
+    peaks: np.ndarray
+
+    @property
+    def ruined(self) -> np.ndarray:
+        return self.ruin_rounds >= 0
+
+    @property
+    def ruin_probability(self) -> float:
+        return float(np.mean(self.ruined))
+
+    def time_to_ruin(self) -> np.ndarray:
+        return self.ruin_rounds[self.ruined]
+
+    def drawdown_quantiles(
+        self, quantiles=(0.5, 0.9, 0.99)
+    ) -> dict[float, float]:
+        values = np.quantile(self.max_drawdowns, quantiles)
+        return dict(zip(quantiles, values.tolist()))
+
+
+def simulate_bankrolls(
+    num_bankrolls: int,
+    num_rounds: int,
+    purse: int = 1000,
+    betting: Optional[BetScheme] = None,
+    policy=None,
+    num_decks: Optional[int] = None,
+    penetration: float = 0.75,
+    seed=None,
+) -> BankrollResults:
+    # without ``num_decks`` every bankroll plays from the infinite shoe of
+    # ``simulate``, which leaves nothing to count
+    if betting is None:
+        betting = FlatBet()
+    if getattr(betting, "counts_cards", False) and num_decks is None:
+        raise ValueError("count based betting needs num_decks")
+    rng = np.random.default_rng(seed)
+    shoes = None
+    if num_decks is not None:
+        shoes = Shoes(num_bankrolls, num_decks, penetration, rng)
+
+    purses = np.full(num_bankrolls, purse, dtype=np.int64)
+    peaks = purses.copy()
+    max_drawdowns = np.zeros(num_bankrolls, dtype=np.int64)
+    ruin_rounds = np.full(num_bankrolls, -1, dtype=np.int64)
+    active = np.arange(num_bankrolls)
+    for round_number in range(num_rounds):
+        if shoes is not None:
+            shoes.shuffle_if_needed()
+            true_counts = shoes.true_counts(active)
+            draw = shoes.dealer(active)
+        else:
+            true_counts = np.zeros(active.size)
+            draw = None
+        stakes = purses[active]
+        bets = np.minimum(betting(stakes, true_counts), stakes)
+
+        results = simulate_rounds(
+            active.size, policy=policy, rng=rng, draw=draw
+        )
+        deltas = np.where(
+            results.blackjacks, 3 * bets // 2, results.outcomes * bets
+        )
+        stakes += deltas
+        purses[active] = stakes
+        peaks[active] = np.maximum(peaks[active], stakes)
+        max_drawdowns[active] = np.maximum(
+            max_drawdowns[active], peaks[active] - stakes
+        )
+
+        ruined = stakes <= 0
+        ruin_rounds[active[ruined]] = round_number + 1
+        active = active[~ruined]
+        if not active.size:
+            break
+
+    return BankrollResults(purses, ruin_rounds, max_drawdowns, peaks)
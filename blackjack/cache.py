@@ -0,0 +1,25 @@
+import os
+import tempfile
+from typing import BinaryIO, Callable
+
+# Files that are expensive to produce but can be rebuilt at any time live in
+# a per-user cache directory, shared by every process on the machine.
+
+CACHE_DIR = os.environ.get(
+    "BLACKJACK_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "blackjack"),
+)
+
+
+def write_atomic(path: str, write: Callable[[BinaryIO], None]):
+    # build next to the destination and move it into place, so concurrent
+    # processes never see a half-written file
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
@@ -0,0 +1,50 @@
+from typing import Sequence
+
+from .engine import CARDS, SUITS, VALUES, Card, Shoe
+from .probability import Composition, composition_from_ranks
+
+# What is known about the rest of the shoe from the cards seen so far. The
+# tracker is told about every card as it is revealed and keeps its counts up
+# to date as it goes, so reading them never means recounting the shoe. Cards
+# that are dealt face down, like the dealer's hole card, only count once they
+# are turned over.
+
+# the Hi-Lo tag of every card value, indexed by value - 1
+HI_LO = (-1, 1, 1, 1, 1, 1, 0, 0, 0, -1, -1, -1, -1)
+
+
+class CountTracker:
+    def __init__(self, shoe: Shoe, tags: Sequence[int] = HI_LO):
+        self.shoe = shoe
+        self.tags = tuple(tags)
+        self.ranks: list[int] = []  # unseen cards of each value, value - 1
+        self.unseen = 0
+        self.running_count = 0
+        self.reset()
+        # whatever was seen says nothing about a freshly shuffled shoe
+        shoe.on_shuffle.append(self.reset)
+
+    def reset(self):
+        num_decks = self.shoe.num_decks
+        self.ranks = [len(SUITS) * num_decks] * len(VALUES)
+        self.unseen = len(CARDS) * num_decks
+        self.running_count = 0
+
+    def observe(self, card: Card):
+        i = card[1] - 1
+        self.ranks[i] -= 1
+        self.unseen -= 1
+        self.running_count += self.tags[i]
+
+    @property
+    def decks_remaining(self) -> float:
+        return self.unseen / len(CARDS)
+
+    @property
+    def true_count(self) -> float:
+        # the running count per deck left; a nearly empty shoe is counted as
+        # half a deck, as is usual, rather than blowing up
+        return self.running_count / max(self.decks_remaining, 0.5)
+
+    def composition(self) -> Composition:
+        return composition_from_ranks(self.ranks)
@@ -1,24 +1,55 @@
-import random
 from typing import Iterable, Optional
 
 import numpy as np
 from arcade import BasicSprite, SpriteList, easing
 
-from . import CARD_SCALE, SCREEN_SIZE, SEAT_PADDING
+from . import CARD_SCALE, CARD_SIZE, SCREEN_SIZE, SEAT_PADDING, engine
+from .count import CountTracker
+from .instrument import FrameProfiler, timed
 from .seat import Seat
 from .textures import CARD_BACKS, CARD_FACES
 from .utilities import SequenceEasing
 
+# the code of a card that has not been dealt yet
+NO_FACE = -1
+
 
 class Card(BasicSprite):
-    def __init__(self, suit: str, value: int, back: str, scale: float):
-        self.suit = suit
-        self.value = value
-        self.face_texture = CARD_FACES[suit, value]
+    # Every card in the deck looks the same from the back, so which card this
+    # is only gets decided by the engine when it is dealt. It is kept as its
+    # index in ``engine.CARDS``, and cards are recycled once they have been
+    # played, so the sprites are made once and reused for the whole game.
+    __slots__ = ("code", "face_texture", "back_texture")
+
+    def __init__(self, back: str, scale: float):
+        self.code = NO_FACE
+        self.face_texture = None
         self.back_texture = CARD_BACKS[back]
         super().__init__(self.back_texture, scale=scale)
         self.texture = self.back_texture
-        self.dealt = False
+
+    @property
+    def face(self) -> Optional[engine.Card]:
+        if self.code == NO_FACE:
+            return None
+        return engine.CARDS[self.code]
+
+    @property
+    def value(self) -> Optional[int]:
+        if self.code == NO_FACE:
+            return None
+        return self.code % len(engine.VALUES) + 1
+
+    def set_face(self, face: engine.Card):
+        self.code = engine.CARD_INDEX[face]
+        self.face_texture = CARD_FACES[face]
+
+    def reset(self, scale: float):
+        # face down and undealt, as if it were new
+        self.code = NO_FACE
+        self.face_texture = None
+        self.texture = self.back_texture
+        self.scale = scale
 
     def swap_texture(self):
         if self.texture == self.back_texture:
@@ -32,60 +63,124 @@ class Card(BasicSprite):
         easing_data.series().add_easing_data(
             self, "width", easing.ease_value(self.width, 0, time=mid_time)
         )
-        easing_data.series().add_function_data(
-            self, "swap_texture", (), {}
-        )
+        easing_data.series().add_function_data(self, "swap_texture", (), {})
         easing_data.series().add_easing_data(
             self, "width", easing.ease_value(0, self.width, time=mid_time)
         )
 
 
+# the most card backs ever drawn in the pile; bigger shoes are drawn as
+# proportionally thinner piles rather than with a sprite per card
+PILE_SIZE = len(engine.CARDS)
+
+
 class Deck(SpriteList):
-    def __init__(self, window_width: int, window_height: int, card_back: str):
+    # Every card on the table belongs to the deck, so that all of them are
+    # drawn with a single draw call: the pile bottom to top, and the cards
+    # that have been dealt in the order they landed. Seats keep track of their
+    # own cards as well, without drawing them.
+    def __init__(
+        self,
+        window_width: int,
+        window_height: int,
+        card_back: str,
+        shoe: engine.Shoe,
+        instant: bool = False,
+        tracker: Optional[CountTracker] = None,
+        profiler: Optional[FrameProfiler] = None,
+    ):
         super().__init__()
         self.scale = 0.0
         self.anchor = np.zeros(2)
         self.offset = 0.0
         self.card_back = card_back
+        self.shoe = shoe
+        self.pile: list[Card] = []  # the undealt sprites, bottom to top
+        # sprites taken off the table, to be used again before making more
+        self.spare: list[Card] = []
         self.easing_data = SequenceEasing()
+        # skip the animations and apply every move, flip and hand-over
+        # straight away, for when nobody is watching
+        self.instant = instant
+        # counts the cards as they are turned face up on screen
+        self.tracker = tracker
+        self.profiler = profiler
 
     @property
     def card_scale(self):
-        return self.scale * CARD_SCALE
+        # the card textures are already CARD_SCALE of the source images
+        return self.scale
+
+    @property
+    def pile_target(self) -> int:
+        remaining = -(-len(self.shoe) // self.shoe.num_decks)
+        return min(PILE_SIZE, remaining)
+
+    def place(self, card: Card, i: int):
+        # by its center, which is quicker to set than its left and top
+        step = int(self.offset * i)
+        card.position = (
+            self.anchor[0] + step + card.width / 2,
+            self.anchor[1] - step - card.height / 2,
+        )
 
-    def add_deck(self):
-        new_cards = list(CARD_FACES.keys())
-        random.shuffle(new_cards)
+    def pile_positions(self) -> list[list[float]]:
+        # the centers ``place`` puts every sprite of the pile at
+        steps = (self.offset * np.arange(len(self.pile))).astype(int)
+        centers = self.anchor + self.scale * CARD_SIZE * [0.5, -0.5]
+        return (centers + steps[:, np.newaxis] * [1, -1]).tolist()
 
-        card_scale = self.card_scale
-        for i, (suit, value) in enumerate(new_cards):
-            self.insert(0, Card(suit, value, self.card_back, card_scale))
+    def take_card(self) -> Card:
+        if self.spare:
+            card = self.spare.pop()
+            card.reset(self.card_scale)
+            return card
+        return Card(self.card_back, self.card_scale)
 
-        offset = self.offset
-        anchor = self.anchor
-        for i, card in enumerate(self):
-            card.left = anchor[0] + int(offset * i)
-            card.top = anchor[1] - int(offset * i)
+    @timed("refill_ms")
+    def refill(self):
+        # top the pile back up to match the shoe, e.g. after a shuffle; only
+        # the missing sprites are laid out
+        new_cards = []
+        for i in range(len(self.pile), self.pile_target):
+            card = self.take_card()
+            self.place(card, i)
+            new_cards.append(card)
+        self.pile.extend(new_cards)
+        self.extend(new_cards)
 
+    @timed("deal_ms", counter="deals")
     def deal_card(
         self,
         seat: Seat,
+        face: engine.Card,
         flip: bool = True,
         start_time: float = 0.0,
         duration: float = 0.5,
     ):
-        # determine which card we are sending to the seat
-        if len(self) == 0:
-            self.add_deck()
-        card = None
-        for card in reversed(self):
-            if not card.dealt:
-                break
-        card.dealt = True
+        # the shoe has already given up this card, so take a sprite off the
+        # pile if it is now too tall, otherwise conjure one up on top of it
+        if len(self.pile) > self.pile_target:
+            card = self.pile.pop()
+        else:
+            card = self.take_card()
+            self.place(card, len(self.pile))
+            self.append(card)
+        card.set_face(face)
 
         # determine where on the screen we are sending the card
         new_left, new_top = seat.card_anchors[len(seat)]
 
+        if self.instant:
+            if flip:
+                card.swap_texture()
+                self.count_card(card)
+            self.raise_card(card)
+            seat.append(card)
+            card.left = new_left
+            card.top = new_top
+            return
+
         # midpoint is important for texture swapping and parent hand-over
         mid_time = duration / 2
         mid_left = card.left + (new_left - card.left) / 2
@@ -109,10 +204,13 @@ class Deck(SpriteList):
             self.easing_data.parallel().add_function_data(
                 card, "swap_texture", (), {}, delay=mid_time
             )
+            self.easing_data.parallel().add_function_data(
+                self, "count_card", (card,), {}, delay=mid_time
+            )
 
         # exchange card parent
         self.easing_data.series().add_function_data(
-            self, "remove", (card,), {}, delay=0.1
+            self, "raise_card", (card,), {}, delay=0.1
         )
         self.easing_data.parallel().add_function_data(
             seat, "append", (card,), {}, delay=0.1
@@ -140,16 +238,48 @@ class Deck(SpriteList):
             seat, "anchor_cards", (), {}
         )
 
+    def raise_card(self, card: Card):
+        # on top of everything dealt so far, as it lands in its seat
+        self.remove(card)
+        self.append(card)
+
+    def discard(self, seats: Iterable[Seat]):
+        # take the cards of the last round off the table, and keep them to be
+        # dealt again; whatever is still being flipped or moved gets there
+        # first, so every card is counted before the shoe is shuffled
+        self.easing_data.finish()
+        for seat in seats:
+            for card in seat:
+                self.remove(card)
+                self.spare.append(card)
+            seat.discard_cards()
+
+    def count_card(self, card: Card):
+        if self.tracker is not None:
+            self.tracker.observe(card.face)
+
+    def flip_card(self, card: Card):
+        if self.instant:
+            card.swap_texture()
+            self.count_card(card)
+            return
+        card.easing_swap_texture(self.easing_data)
+        # the swap is a step of its own, so this runs as the face comes up
+        self.easing_data.parallel().add_function_data(
+            self, "count_card", (card,), {}
+        )
+
     def on_resize(self, window_width, window_height):
         self.scale = min([window_width, window_height] / SCREEN_SIZE)
         self.anchor = [0, window_height] + self.scale * np.array(
             [SEAT_PADDING, -SEAT_PADDING]
         )
         self.offset = self.scale * CARD_SCALE / 2
-        for i, card in enumerate(self):
-            card.scale = self.scale * CARD_SCALE
-            card.left = self.anchor[0] + int(self.offset * i)
-            card.top = self.anchor[1] - int(self.offset * i)
+        card_scale = self.card_scale
+        for card in self:
+            card.scale = card_scale
+        for card, position in zip(self.pile, self.pile_positions()):
+            card.position = position
 
     def on_update(
         self, delta_time: float = 1 / 60, names: Optional[Iterable[str]] = None
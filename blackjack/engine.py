@@ -0,0 +1,323 @@
+import itertools as it
+from typing import TYPE_CHECKING, Callable, NamedTuple, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .count import CountTracker
+
+# The rules of the game, free of any rendering concerns. Nothing in here may
+# import arcade (directly or through ``textures``), so that rounds can be
+# played headless at full speed.
+
+SUITS = ("S", "H", "C", "D")
+VALUES = tuple(range(1, 14))
+DEALER_STANDS_ON = 17
+BLACKJACK = 21
+
+Card = tuple[str, int]
+CARDS: tuple[Card, ...] = tuple(it.product(SUITS, VALUES))
+# every card as one small int, its index in CARDS, as the shoe deals them:
+# the suit times the number of values, plus the value less one
+CARD_INDEX: dict[Card, int] = {card: i for i, card in enumerate(CARDS)}
+MAX_DECKS = 8
+
+
+def card_points(value: int) -> int:
+    if value >= 10:
+        return 10
+    return value
+
+
+def dealer_will_stay(total: int) -> bool:
+    return total >= DEALER_STANDS_ON
+
+
+class HandValue(NamedTuple):
+    # the running state of a hand, with aces counted as 1 in ``hard_total``
+    hard_total: int = 0
+    aces: int = 0
+
+    @property
+    def soft(self) -> bool:
+        return self.aces > 0 and self.hard_total + 10 <= BLACKJACK
+
+    @property
+    def total(self) -> int:
+        if self.soft:
+            return self.hard_total + 10
+        return self.hard_total
+
+
+class Shoe:
+    def __init__(
+        self, num_decks: int = 1, penetration: float = 0.75, seed=None
+    ):
+        if not 1 <= num_decks <= MAX_DECKS:
+            raise ValueError(f"num_decks must be between 1 and {MAX_DECKS}")
+        if not 0.0 < penetration <= 1.0:
+            raise ValueError("penetration must be in (0, 1]")
+        self.num_decks = num_decks
+        self.penetration = penetration
+        self.rng = np.random.default_rng(seed)
+        # the shuffled shoe, as indices into CARDS, and how far we have dealt
+        self.order = np.empty(0, dtype=np.int8)
+        self.position = 0
+        # called after every shuffle, e.g. to reset a card count
+        self.on_shuffle: list[Callable[[], None]] = []
+        self.shuffle()
+
+    def __len__(self):
+        return len(self.order) - self.position
+
+    @property
+    def cut(self) -> int:
+        # where the cut card sits; once it is reached, the shoe gets shuffled
+        # before the next round
+        return int(self.penetration * len(self.order))
+
+    @property
+    def needs_shuffle(self) -> bool:
+        return self.position >= self.cut
+
+    def composition(self) -> np.ndarray:
+        # how many cards of each value are left, indexed by value - 1
+        remaining = self.order[self.position :] % len(VALUES)
+        return np.bincount(remaining, minlength=len(VALUES))
+
+    def shuffle(self):
+        deck = np.arange(len(CARDS), dtype=np.int8)
+        self.order = self.rng.permutation(np.tile(deck, self.num_decks))
+        self.position = 0
+        for callback in self.on_shuffle:
+            callback()
+
+    def draw(self) -> Card:
+        # only a fully dealt shoe gets shuffled mid-round
+        if self.position >= len(self.order):
+            self.shuffle()
+        card = CARDS[self.order[self.position]]
+        self.position += 1
+        return card
+
+
+class Hand:
+    def __init__(self):
+        self.cards: list[Card] = []
+        self.hard_total = 0
+        self.aces = 0
+
+    def __len__(self):
+        return len(self.cards)
+
+    @property
+    def value(self) -> HandValue:
+        return HandValue(self.hard_total, self.aces)
+
+    @property
+    def total(self) -> int:
+        return self.value.total
+
+    @property
+    def soft(self) -> bool:
+        return self.value.soft
+
+    @property
+    def is_blackjack(self) -> bool:
+        return len(self.cards) == 2 and self.total == BLACKJACK
+
+    @property
+    def busted(self) -> bool:
+        return self.hard_total > BLACKJACK
+
+    def add(self, card: Card):
+        value = card[1]
+        self.cards.append(card)
+        self.hard_total += card_points(value)
+        if value == 1:
+            self.aces += 1
+
+    def clear(self):
+        self.cards.clear()
+        self.hard_total = 0
+        self.aces = 0
+
+
+class DealerHand(Hand):
+    def will_stay(self) -> bool:
+        return dealer_will_stay(self.total)
+
+
+class PlayerHand(Hand):
+    def __init__(self, purse: int = 1000, bet: int = 100):
+        super().__init__()
+        self.bet = bet
+        self.purse = purse
+        self.bet_resolved: Optional[str] = None
+
+    def clear(self):
+        super().clear()
+        self.bet_resolved = None
+
+    def resolve_bet(self, dealer_total: Optional[int] = None):
+        if self.bet_resolved:
+            return
+
+        value = self.total
+
+        # Black Jack is an auto-win condition
+        if self.is_blackjack:
+            self.purse += int(1.5 * self.bet)
+            self.bet_resolved = "W"
+            return
+        # Bust is an auto lose condition
+        if value > BLACKJACK:
+            self.purse -= self.bet
+            self.bet_resolved = "L"
+            return
+        # any other condition requires knowledge of the dealer's score
+        if dealer_total is None:
+            return
+
+        # we know the player hasn't busted, so...
+        if dealer_total > BLACKJACK:
+            # the dealer busted, player wins
+            self.purse += self.bet
+            self.bet_resolved = "W"
+        elif dealer_total > value:
+            # the dealer has a higher score
+            self.purse -= self.bet
+            self.bet_resolved = "L"
+        elif value > dealer_total:
+            # the player has a higher score
+            self.purse += self.bet
+            self.bet_resolved = "W"
+        else:
+            # tie, aka "push"
+            self.bet_resolved = "T"
+
+
+class Table:
+    def __init__(
+        self,
+        num_players: int,
+        purse: int = 1000,
+        seed=None,
+        num_decks: int = 1,
+        penetration: float = 0.75,
+    ):
+        self.num_players = num_players
+        self.shoe = Shoe(num_decks, penetration, seed)
+        # set to a ``count.CountTracker`` of the shoe to keep count of the
+        # cards as the players get to see them
+        self.tracker: Optional["CountTracker"] = None
+        self.hole_card_seen = False
+        self.dealer = DealerHand()
+        self.players = [PlayerHand(purse) for _ in range(num_players)]
+        self.player_idx: int = 0
+        self.round_over = False
+
+    @property
+    def current_player(self) -> Optional[PlayerHand]:
+        if self.player_idx < self.num_players:
+            return self.players[self.player_idx]
+        return None
+
+    @property
+    def dealer_turn(self) -> bool:
+        return self.player_idx >= self.num_players
+
+    @property
+    def upcard(self) -> Optional[int]:
+        if self.dealer.cards:
+            return self.dealer.cards[0][1]
+        return None
+
+    def deal(self, hand: Hand, face_up: bool = True) -> Card:
+        card = self.shoe.draw()
+        hand.add(card)
+        if face_up and self.tracker is not None:
+            self.tracker.observe(card)
+        return card
+
+    def shuffle_if_needed(self) -> bool:
+        if self.shoe.needs_shuffle:
+            self.shoe.shuffle()
+            return True
+        return False
+
+    def new_round(self) -> list[tuple[Hand, Card]]:
+        self.shuffle_if_needed()
+        self.dealer.clear()
+        for player in self.players:
+            player.clear()
+        self.player_idx = 0
+        self.round_over = False
+        self.hole_card_seen = False
+
+        # every player gets a card, then the dealer, then every player again,
+        # and finally the dealer's hole card
+        dealt = []
+        for hand in self.players + [self.dealer] + self.players:
+            dealt.append((hand, self.deal(hand)))
+        dealt.append((self.dealer, self.deal(self.dealer, face_up=False)))
+        return dealt
+
+    def hit(self) -> Optional[Card]:
+        player = self.current_player
+        if player is None or self.round_over:
+            return None
+        return self.deal(player)
+
+    def stand(self):
+        if not self.dealer_turn:
+            self.player_idx += 1
+
+    def advance(self) -> Optional[Card]:
+        if self.round_over:
+            return None
+
+        # go through players in order
+        while self.player_idx < self.num_players:
+            player = self.players[self.player_idx]
+            if player.purse <= 0:
+                self.player_idx += 1
+                continue
+            player.resolve_bet()
+            if not player.bet_resolved and player.total < BLACKJACK:
+                return None
+            self.player_idx += 1
+
+        # once we are done with the players, it is the dealer's turn, and then
+        # we can resolve any remaining bets
+        if not self.hole_card_seen:
+            self.hole_card_seen = True
+            if self.tracker is not None:
+                self.tracker.observe(self.dealer.cards[1])
+        if self.dealer.will_stay():
+            dealer_total = self.dealer.total
+            for player in self.players:
+                player.resolve_bet(dealer_total)
+            self.round_over = True
+            return None
+        return self.deal(self.dealer)
+
+    def play_round(self, policy=None):
+        # play a full round without any animation; ``policy(player, upcard)``
+        # returns True to hit, and defaults to mimicking the dealer
+        self.new_round()
+        upcard = self.upcard
+        while not self.round_over:
+            card = self.advance()
+            if card is not None or self.round_over:
+                continue
+            player = self.current_player
+            if policy is None:
+                hit = not dealer_will_stay(player.total)
+            else:
+                hit = policy(player, upcard)
+            if hit:
+                self.hit()
+            else:
+                self.stand()
+        return [player.bet_resolved for player in self.players]
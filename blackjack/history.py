@@ -0,0 +1,233 @@
+import os
+from typing import Iterator
+
+import numpy as np
+
+from .engine import CARD_INDEX, CARDS, Card, Table
+
+# Hand histories as fixed-width binary records, one per round, so that a log
+# can be memory-mapped and scanned as a NumPy array rather than parsed. A log
+# starts with a header describing the table, seed included, followed by the
+# rounds in the order they were played.
+#
+# Every card takes a single byte, its index in ``engine.CARDS`` plus one, with
+# zero marking an empty slot. Each hand's cards are stored in the order they
+# were dealt, players first and the dealer last. As the engine always deals
+# in the same order, the order of the whole deal and every player's actions
+# follow from that: a player hit for every card past their first two, and
+# stood unless they reached 21 or went bust.
+
+MAGIC = b"BJHIST"
+HISTORY_VERSION = 1
+MAX_HAND_CARDS = 11  # as many cards as a seat has room for
+NO_CARD = 0
+
+HEADER = np.dtype(
+    [
+        ("magic", "S6"),
+        ("version", "<u2"),
+        ("num_players", "u1"),
+        ("num_decks", "u1"),
+        ("penetration", "<f8"),
+        ("seed", "u1", 16),
+        ("purse", "<i8"),
+        ("bet", "<i8"),
+    ]
+)
+
+
+def record_dtype(num_players: int) -> np.dtype:
+    return np.dtype(
+        [
+            ("round", "<u4"),
+            ("shuffles", "u1"),  # how often the shoe was shuffled before it
+            ("cards", "u1", (num_players + 1, MAX_HAND_CARDS)),
+            ("results", "S1", (num_players,)),  # bet_resolved, or b""
+            ("purses", "<i8", (num_players,)),  # after the round
+        ]
+    )
+
+
+def encode_card(card: Card) -> int:
+    return CARD_INDEX[card] + 1
+
+
+def decode_card(code: int) -> Card:
+    return CARDS[code - 1]
+
+
+class HistoryWriter:
+    def __init__(
+        self, path: str, table: Table, seed: int, buffer_rounds: int = 4096
+    ):
+        # the seed has to be the one ``table`` was created with, for the log
+        # to replay; a log is never written over
+        integer = isinstance(seed, (int, np.integer))
+        if not integer or not 0 <= seed < 1 << 128:
+            raise ValueError(
+                "seed must be the int the table was created with, from 0 to "
+                f"2**128 - 1, not {seed!r}"
+            )
+        self.table = table
+        self.dtype = record_dtype(table.num_players)
+        self.buffer = np.zeros(buffer_rounds, dtype=self.dtype)
+        self.pending = 0
+        self.rounds = 0
+        self.shuffles = 0
+
+        header = np.zeros(1, dtype=HEADER)
+        header["magic"] = MAGIC
+        header["version"] = HISTORY_VERSION
+        header["num_players"] = table.num_players
+        header["num_decks"] = table.shoe.num_decks
+        header["penetration"] = table.shoe.penetration
+        header["seed"] = np.frombuffer(
+            int(seed).to_bytes(16, "little"), np.uint8
+        )
+        header["purse"] = table.players[0].purse
+        header["bet"] = table.players[0].bet
+
+        try:
+            self.file = open(path, "xb")
+        except FileExistsError:
+            raise FileExistsError(
+                f"{path} already holds a hand history; pick another path"
+            ) from None
+        self.file.write(header.tobytes())
+        table.shoe.on_shuffle.append(self.on_shuffle)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def on_shuffle(self):
+        self.shuffles += 1
+
+    def record(self):
+        # called once the table's round is over
+        table = self.table
+        cards = np.zeros((table.num_players + 1, MAX_HAND_CARDS), np.uint8)
+        for i, hand in enumerate(table.players + [table.dealer]):
+            if len(hand) > MAX_HAND_CARDS:
+                raise ValueError("hand has too many cards to record")
+            cards[i, : len(hand)] = [encode_card(card) for card in hand.cards]
+
+        row = self.pending
+        self.buffer["round"][row] = self.rounds
+        self.buffer["shuffles"][row] = min(self.shuffles, 255)
+        self.buffer["cards"][row] = cards
+        self.buffer["results"][row] = [
+            player.bet_resolved or "" for player in table.players
+        ]
+        self.buffer["purses"][row] = [player.purse for player in table.players]
+        self.pending += 1
+        self.rounds += 1
+        self.shuffles = 0
+        if self.pending == len(self.buffer):
+            self.flush()
+
+    def flush(self):
+        self.file.write(self.buffer[: self.pending].tobytes())
+        self.file.flush()
+        self.pending = 0
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.flush()
+        self.file.close()
+        self.table.shoe.on_shuffle.remove(self.on_shuffle)
+
+
+class HistoryReader:
+    def __init__(self, path: str):
+        header = np.fromfile(path, dtype=HEADER, count=1)
+        if len(header) != 1 or header["magic"][0] != MAGIC:
+            raise ValueError(f"{path} is not a hand history")
+        if header["version"][0] != HISTORY_VERSION:
+            raise ValueError(f"{path} has an unsupported history version")
+        self.header = header[0]
+        self.num_players = int(self.header["num_players"])
+        dtype = record_dtype(self.num_players)
+        rounds = (os.path.getsize(path) - HEADER.itemsize) // dtype.itemsize
+        if rounds:
+            self.records = np.memmap(
+                path,
+                dtype=dtype,
+                mode="r",
+                offset=HEADER.itemsize,
+                shape=(rounds,),
+            )
+        else:
+            self.records = np.zeros(0, dtype=dtype)
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def seed(self) -> int:
+        return int.from_bytes(self.header["seed"].tobytes(), "little")
+
+    def hand_sizes(self) -> np.ndarray:
+        # cards in every hand of every round, the dealer's last
+        return np.count_nonzero(self.records["cards"] != NO_CARD, axis=2)
+
+    def hits(self) -> np.ndarray:
+        return np.maximum(self.hand_sizes()[:, :-1] - 2, 0)
+
+    def outcome_counts(self) -> dict[bytes, np.ndarray]:
+        # how many rounds every player won, lost and tied
+        results = self.records["results"]
+        return {
+            code: np.count_nonzero(results == code, axis=0)
+            for code in [b"W", b"L", b"T"]
+        }
+
+    def deal_order(self, i: int) -> list[Card]:
+        cards = self.records["cards"][i]
+        hands = [list(hand[hand != NO_CARD]) for hand in cards]
+        players, dealer = hands[:-1], hands[-1]
+        order = [hand[0] for hand in players] + [dealer[0]]
+        order += [hand[1] for hand in players] + [dealer[1]]
+        for hand in players:
+            order += hand[2:]
+        order += dealer[2:]
+        return [decode_card(code) for code in order]
+
+    def table(self) -> Table:
+        table = Table(
+            self.num_players,
+            purse=int(self.header["purse"]),
+            seed=self.seed,
+            num_decks=int(self.header["num_decks"]),
+            penetration=float(self.header["penetration"]),
+        )
+        for player in table.players:
+            player.bet = int(self.header["bet"])
+        return table
+
+    def replay(self) -> Iterator[Table]:
+        # play the rounds again from the seed and the recorded actions,
+        # yielding the table at the end of every round
+        table = self.table()
+        hits = self.hits()
+        for i, record in enumerate(self.records):
+            table.new_round()
+            while not table.round_over:
+                card = table.advance()
+                if card is not None or table.round_over:
+                    continue
+                player = table.current_player
+                if len(player) - 2 < hits[i, table.player_idx]:
+                    table.hit()
+                else:
+                    table.stand()
+            for hand, recorded in zip(
+                table.players + [table.dealer], record["cards"]
+            ):
+                codes = [encode_card(card) for card in hand.cards]
+                if codes != list(recorded[recorded != NO_CARD]):
+                    raise ValueError(f"round {i} does not replay")
+            yield table
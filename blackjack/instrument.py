@@ -0,0 +1,239 @@
+import csv
+import functools
+import io
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import BinaryIO, Callable, Optional
+
+import numpy as np
+
+from .cache import write_atomic
+
+# Opt-in instrumentation of the game loop, for when a table stutters and there
+# is nothing to go on. Turn it on with BLACKJACK_PROFILE=1 (or --profile), and
+# the window times every frame's update and draw, the draw of every seat, the
+# deals and refills of the deck and the shuffles of the shoe, and counts the
+# draw calls, the tweens that are running and the text objects created.
+#
+# The last ``FRAMES`` frames are kept in a ring buffer, one structured row per
+# frame, summed up by an overlay in the window. With BLACKJACK_PROFILE_DUMP
+# (or --profile-dump) set to a .json or .csv file, the buffer is also written
+# out every ``DUMP_INTERVAL`` seconds and when the window closes.
+
+PROFILE = os.environ.get("BLACKJACK_PROFILE", "") not in ("", "0")
+PROFILE_DUMP = os.environ.get("BLACKJACK_PROFILE_DUMP")
+FRAMES = 600  # ten seconds at 60 fps
+DUMP_INTERVAL = 10.0
+# frames the overlay sums up, and how often it does so
+OVERLAY_FRAMES = 60
+
+FIELDS = [
+    ("time", "<f8"),  # seconds since the profiler started
+    ("update_ms", "<f4"),
+    ("draw_ms", "<f4"),
+    ("deal_ms", "<f4"),
+    ("deals", "<u2"),
+    ("refill_ms", "<f4"),
+    ("shuffle_ms", "<f4"),
+    ("shuffles", "<u2"),
+    ("tweens", "<u4"),  # running or queued when the frame ended
+    ("texts", "<u4"),  # created during the frame
+    ("draw_calls", "<u4"),
+]
+
+
+def frame_dtype(num_seats: int) -> np.dtype:
+    return np.dtype(FIELDS + [("seat_ms", "<f4", (num_seats,))])
+
+
+class FrameProfiler:
+    def __init__(
+        self,
+        num_seats: int,
+        frames: int = FRAMES,
+        dump_path: Optional[str] = None,
+        dump_interval: float = DUMP_INTERVAL,
+    ):
+        if dump_path is not None and not dump_path.endswith((".json", ".csv")):
+            raise ValueError("dump_path must be a .json or .csv file")
+        self.dtype = frame_dtype(num_seats)
+        self.frames = np.zeros(frames, dtype=self.dtype)
+        self.recorded = 0
+        # the frame being measured, written to the buffer once it is over
+        self.row = np.zeros((), dtype=self.dtype)
+        self.started = False
+        self.start = time.perf_counter()
+        self.dump_path = dump_path
+        self.dump_interval = dump_interval
+        self.last_dump = self.start
+        # read at the end of every frame: gauges as they are, counters as the
+        # difference from the frame before
+        self.gauges: dict[str, Callable[[], int]] = {}
+        self.counters: dict[str, Callable[[], int]] = {}
+        self.last_counts: dict[str, int] = {}
+        self.overlay: list[str] = []
+
+    def __len__(self):
+        return min(self.recorded, len(self.frames))
+
+    def gauge(self, field: str, read: Callable[[], int]):
+        self.gauges[field] = read
+
+    def counter(self, field: str, read: Callable[[], int]):
+        self.counters[field] = read
+        self.last_counts[field] = read()
+
+    def add(self, field: str, value: float, index: Optional[int] = None):
+        column = self.row[field]
+        if index is None:
+            self.row[field] = column + value
+        else:
+            column[index] = column[index] + value
+
+    @contextmanager
+    def timed(self, field: str, index: Optional[int] = None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(field, 1000 * (time.perf_counter() - start), index)
+
+    def on_shuffle(self):
+        self.add("shuffles", 1)
+
+    def next_frame(self):
+        # called at the start of every frame, which ends the one before it
+        now = time.perf_counter()
+        if self.started:
+            self.end_frame()
+        self.started = True
+        self.row[()] = 0
+        self.row["time"] = now - self.start
+        if self.dump_path and now - self.last_dump >= self.dump_interval:
+            self.dump()
+            self.last_dump = now
+
+    def end_frame(self):
+        row = self.row
+        for field, read in self.gauges.items():
+            row[field] = read()
+        for field, read in self.counters.items():
+            count = read()
+            row[field] = count - self.last_counts[field]
+            self.last_counts[field] = count
+        self.frames[self.recorded % len(self.frames)] = row
+        self.recorded += 1
+        if self.recorded % OVERLAY_FRAMES == 0:
+            self.overlay = self.summarize(OVERLAY_FRAMES)
+
+    def history(self) -> np.ndarray:
+        # the frames in the buffer, oldest first
+        if self.recorded <= len(self.frames):
+            return self.frames[: self.recorded]
+        return np.roll(self.frames, -(self.recorded % len(self.frames)))
+
+    def summarize(self, frames: int) -> list[str]:
+        recent = self.history()[-frames:]
+        if not len(recent):
+            return []
+        update, draw = recent["update_ms"], recent["draw_ms"]
+        deals = max(int(recent["deals"].sum()), 1)
+        seats = recent["seat_ms"].mean(axis=0)
+        return [
+            f"update {update.mean():.2f} ms  max {update.max():.2f}",
+            f"draw {draw.mean():.2f} ms  max {draw.max():.2f}",
+            "seats " + " ".join(f"{ms:.2f}" for ms in seats.tolist()),
+            f"deal {recent['deal_ms'].sum() / deals:.2f} ms  "
+            f"refill {recent['refill_ms'].max():.2f} ms  "
+            f"shuffle {recent['shuffle_ms'].max():.2f} ms",
+            f"draw calls {recent['draw_calls'].max()}  "
+            f"tweens {recent['tweens'].max()}  "
+            f"texts {recent['texts'].sum()}",
+        ]
+
+    def records(self) -> list[dict]:
+        return [
+            {field: row[field].tolist() for field in self.dtype.names}
+            for row in self.history()
+        ]
+
+    def write_json(self, f: BinaryIO):
+        f.write(json.dumps(self.records()).encode())
+
+    def write_csv(self, f: BinaryIO):
+        text = io.StringIO()
+        writer = csv.writer(text)
+        num_seats = self.dtype["seat_ms"].shape[0]
+        names = [field for field, _ in FIELDS]
+        writer.writerow(names + [f"seat_ms_{i}" for i in range(num_seats)])
+        for row in self.history():
+            writer.writerow(
+                [row[field].item() for field in names]
+                + row["seat_ms"].tolist()
+            )
+        f.write(text.getvalue().encode())
+
+    def dump(self, path: Optional[str] = None):
+        path = os.path.abspath(path or self.dump_path)
+        if path.endswith(".csv"):
+            write_atomic(path, self.write_csv)
+        else:
+            write_atomic(path, self.write_json)
+
+
+def timed(field: str, counter: Optional[str] = None):
+    # time a method into the ``profiler`` of its object, if it has one
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            profiler = self.profiler
+            if profiler is None:
+                return method(self, *args, **kwargs)
+            if counter is not None:
+                profiler.add(counter, 1)
+            with profiler.timed(field):
+                return method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class DrawCalls:
+    # Counts the draw calls made through arcade and pyglet, by wrapping the
+    # methods that every one of them goes through. Nothing is wrapped until
+    # ``install`` is called.
+    count = 0
+    installed = False
+
+    @classmethod
+    def install(cls):
+        if cls.installed:
+            return
+        from arcade.gl import Geometry
+        from pyglet.graphics import vertexdomain
+
+        for owner in (
+            Geometry,
+            vertexdomain.VertexDomain,
+            vertexdomain.IndexedVertexDomain,
+        ):
+            for name in ("render", "draw", "draw_subset"):
+                if name in owner.__dict__:
+                    setattr(owner, name, cls.counted(owner.__dict__[name]))
+        cls.installed = True
+
+    @classmethod
+    def counted(cls, method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            cls.count += 1
+            return method(*args, **kwargs)
+
+        return wrapper
+
+    @classmethod
+    def read(cls) -> int:
+        return cls.count
@@ -0,0 +1,152 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, NamedTuple, Optional, Union
+
+import numpy as np
+
+from .simulate import simulate_rounds
+from .stats import RunningStats
+
+if TYPE_CHECKING:
+    from .policy import Policy
+
+# Rounds are split into fixed-size chunks and every chunk gets its own child
+# of one SeedSequence, which also seeds any random policy playing it. How the
+# chunks are spread over the workers has no influence on what gets dealt or
+# decided, so a given seed always gives the same result whatever the number
+# of workers. The same goes for stopping early: chunks are
+# always taken in order, up to the first one after which the confidence
+# interval is narrow enough.
+
+CHUNK_SIZE = 1 << 20
+
+
+class SimulationSummary(NamedTuple):
+    rounds: int
+    wins: int
+    losses: int
+    pushes: int
+    blackjacks: int
+    net: int
+    purse: Optional[np.ndarray]  # the purse after every round, if requested
+    stats: RunningStats
+
+
+class _Chunk(NamedTuple):
+    start: int
+    stop: int
+    seed: np.random.SeedSequence
+    policy: Union[np.ndarray, "Policy", None]
+    bet: int
+    shm_name: Optional[str]
+    total_rounds: int
+
+
+def _run_chunk(chunk: _Chunk) -> RunningStats:
+    policy = chunk.policy
+    if policy is not None and not isinstance(policy, np.ndarray):
+        # a policy that draws random numbers of its own draws them from the
+        # chunk's seed as well, rather than from wherever it was left
+        policy = policy.seeded(chunk.seed.spawn(1)[0])
+    results = simulate_rounds(
+        chunk.stop - chunk.start,
+        policy=policy,
+        bet=chunk.bet,
+        rng=np.random.default_rng(chunk.seed),
+    )
+    if chunk.shm_name is not None:
+        # the per-round deltas go straight into shared memory rather than
+        # being pickled back to the parent
+        shm = shared_memory.SharedMemory(name=chunk.shm_name)
+        try:
+            deltas = np.ndarray(
+                (chunk.total_rounds,), dtype=np.int64, buffer=shm.buf
+            )
+            deltas[chunk.start : chunk.stop] = results.deltas
+            del deltas
+        finally:
+            shm.close()
+    stats = RunningStats()
+    stats.add_results(results)
+    return stats
+
+
+def run_simulation(
+    num_rounds: int,
+    seed=None,
+    policy: Union[np.ndarray, "Policy", None] = None,
+    bet: int = 100,
+    purse: Optional[int] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+    ci_width: Optional[float] = None,
+    confidence: float = 0.95,
+) -> SimulationSummary:
+    # pass a starting ``purse`` to also get the purse trajectory back, and a
+    # ``ci_width`` to stop as soon as the ``confidence`` interval of the mean
+    # delta per round is no wider than that
+    if workers is None:
+        workers = os.cpu_count() or 1
+    bounds = list(range(0, num_rounds, chunk_size)) + [num_rounds]
+    seeds = np.random.SeedSequence(seed).spawn(len(bounds) - 1)
+
+    shm = None
+    if purse is not None:
+        shm = shared_memory.SharedMemory(
+            create=True, size=max(num_rounds, 1) * np.dtype(np.int64).itemsize
+        )
+    try:
+        chunks = [
+            _Chunk(
+                start,
+                stop,
+                chunk_seed,
+                policy,
+                bet,
+                shm.name if shm is not None else None,
+                num_rounds,
+            )
+            for start, stop, chunk_seed in zip(bounds, bounds[1:], seeds)
+        ]
+        stats = RunningStats()
+
+        def done() -> bool:
+            if ci_width is None:
+                return False
+            return 2 * stats.half_width(confidence) <= ci_width
+
+        if workers <= 1 or len(chunks) <= 1:
+            for chunk in chunks:
+                stats.merge(_run_chunk(chunk))
+                if done():
+                    break
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_run_chunk, chunk) for chunk in chunks]
+                for future in futures:
+                    stats.merge(future.result())
+                    if done():
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        break
+
+        trajectory = None
+        if shm is not None:
+            deltas = np.ndarray((num_rounds,), dtype=np.int64, buffer=shm.buf)
+            trajectory = purse + np.cumsum(deltas[: stats.count])
+            del deltas
+    finally:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+
+    return SimulationSummary(
+        stats.count,
+        stats.wins,
+        stats.losses,
+        stats.pushes,
+        stats.blackjacks,
+        stats.net,
+        trajectory,
+        stats,
+    )
@@ -0,0 +1,100 @@
+from abc import ABC, abstractmethod
+from typing import Sequence
+
+import numpy as np
+
+from .engine import BLACKJACK, Hand, HandValue, PlayerHand
+from .simulate import POLICY_SHAPE, dealer_policy
+
+# Bots that decide whether a hand hits or stands. Every policy decides for a
+# whole batch of hands at once from arrays of the soft flags, totals and
+# dealer upcards (as card values or points, aces counting as 1), and gets the
+# single hand forms on top of that. A hand that has reached 21 never hits.
+#
+# Policies can be handed to ``engine.Table.play_round``,
+# ``simulate.simulate_rounds`` and the seats of the game window alike.
+
+
+class Policy(ABC):
+    @abstractmethod
+    def decide(
+        self, soft: np.ndarray, totals: np.ndarray, upcards: np.ndarray
+    ) -> np.ndarray:
+        pass
+
+    def seeded(self, seed: np.random.SeedSequence) -> "Policy":
+        # the policy to play one chunk of ``parallel.run_simulation`` with,
+        # which has to draw from that chunk's seed if it draws at all
+        return self
+
+    def decide_hands(
+        self, hands: Sequence[Hand], upcards: Sequence[int]
+    ) -> np.ndarray:
+        values = [hand.value for hand in hands]
+        return self.decide(
+            np.array([value.soft for value in values], dtype=bool),
+            np.array([value.total for value in values], dtype=np.int16),
+            np.asarray(upcards),
+        )
+
+    def should_hit(self, value: HandValue, upcard: int) -> bool:
+        hit = self.decide(
+            np.array([value.soft]), np.array([value.total]), np.array([upcard])
+        )
+        return bool(hit[0])
+
+    def __call__(self, player: PlayerHand, upcard: int) -> bool:
+        return self.should_hit(player.value, upcard)
+
+
+class TablePolicy(Policy):
+    # a boolean "hit?" lookup table, indexed like ``simulate.POLICY_SHAPE``
+    def __init__(self, table: np.ndarray):
+        if table.shape != POLICY_SHAPE:
+            raise ValueError(f"table must have shape {POLICY_SHAPE}")
+        self.table = np.asarray(table, dtype=bool)
+
+    def decide(
+        self, soft: np.ndarray, totals: np.ndarray, upcards: np.ndarray
+    ) -> np.ndarray:
+        totals = np.asarray(totals)
+        hit = self.table[
+            np.asarray(soft, dtype=np.intp),
+            np.minimum(totals, BLACKJACK),
+            np.minimum(upcards, 10),
+        ]
+        return hit & (totals < BLACKJACK)
+
+    def should_hit(self, value: HandValue, upcard: int) -> bool:
+        if value.total >= BLACKJACK:
+            return False
+        return bool(self.table[int(value.soft), value.total, min(upcard, 10)])
+
+
+class MimicDealer(TablePolicy):
+    # hit below 17 whatever the dealer shows, the engine's default
+    def __init__(self):
+        super().__init__(dealer_policy())
+
+
+class RandomPolicy(Policy):
+    def __init__(self, hit_probability: float = 0.5, seed=None):
+        if not 0.0 <= hit_probability <= 1.0:
+            raise ValueError("hit_probability must be in [0, 1]")
+        self.hit_probability = hit_probability
+        self.rng = np.random.default_rng(seed)
+
+    def seeded(self, seed: np.random.SeedSequence) -> "RandomPolicy":
+        return RandomPolicy(self.hit_probability, seed)
+
+    def decide(
+        self, soft: np.ndarray, totals: np.ndarray, upcards: np.ndarray
+    ) -> np.ndarray:
+        totals = np.asarray(totals)
+        hit = self.rng.random(totals.shape) < self.hit_probability
+        return hit & (totals < BLACKJACK)
+
+    def should_hit(self, value: HandValue, upcard: int) -> bool:
+        if value.total >= BLACKJACK:
+            return False
+        return bool(self.rng.random() < self.hit_probability)
@@ -0,0 +1,85 @@
+from functools import lru_cache
+from typing import Sequence
+
+import numpy as np
+
+from .engine import BLACKJACK, DEALER_STANDS_ON, SUITS, Shoe
+
+# Exact odds of how the dealer's hand ends up, given their upcard and what is
+# left in the shoe. The shoe is described by a compact composition vector:
+# how many cards of each point value remain, aces first and every ten-valued
+# card counted together, i.e. indexed by points - 1.
+
+FINAL_TOTALS = tuple(range(DEALER_STANDS_ON, BLACKJACK + 1))
+BUST = len(FINAL_TOTALS)  # index of the bust probability in a distribution
+FULL_DECK = (len(SUITS),) * 9 + (4 * len(SUITS),)
+
+Composition = tuple[int, ...]
+
+
+def composition_from_ranks(counts: Sequence[int]) -> Composition:
+    # fold a per-rank count (index value - 1, kings last) into points
+    counts = [int(count) for count in counts]
+    return tuple(counts[:9]) + (sum(counts[9:]),)
+
+
+def shoe_composition(shoe: Shoe) -> Composition:
+    return composition_from_ranks(shoe.composition())
+
+
+def full_shoe(num_decks: int = 1) -> Composition:
+    return tuple(num_decks * count for count in FULL_DECK)
+
+
+@lru_cache(maxsize=1 << 18)
+def _distribution(
+    hard_total: int, aces: bool, composition: Composition, num_decks: int
+) -> tuple[float, ...]:
+    total = hard_total
+    if aces and hard_total + 10 <= BLACKJACK:
+        total += 10
+    result = [0.0] * (BUST + 1)
+    if total > BLACKJACK:
+        result[BUST] = 1.0
+        return tuple(result)
+    if total >= DEALER_STANDS_ON:
+        result[total - DEALER_STANDS_ON] = 1.0
+        return tuple(result)
+
+    remaining = sum(composition)
+    if remaining == 0:
+        # the engine shuffles a fully dealt shoe, so carry on with a new one
+        composition = full_shoe(num_decks)
+        remaining = sum(composition)
+    for i, count in enumerate(composition):
+        if not count:
+            continue
+        drawn = composition[:i] + (count - 1,) + composition[i + 1 :]
+        outcome = _distribution(
+            hard_total + i + 1, aces or i == 0, drawn, num_decks
+        )
+        weight = count / remaining
+        for j, p in enumerate(outcome):
+            result[j] += weight * p
+    return tuple(result)
+
+
+def dealer_distribution(
+    upcard: int, composition: Composition, num_decks: int = 1
+) -> np.ndarray:
+    # probabilities of the dealer finishing on 17, 18, 19, 20, 21 or busting,
+    # with the hole card still to come out of ``composition``, a shoe of
+    # ``num_decks`` decks
+    points = min(upcard, 10)
+    composition = tuple(int(c) for c in composition)
+    return np.array(_distribution(points, points == 1, composition, num_decks))
+
+
+def dealer_bust_probability(
+    upcard: int, composition: Composition, num_decks: int = 1
+) -> float:
+    return float(dealer_distribution(upcard, composition, num_decks)[BUST])
+
+
+def clear_cache():
+    _distribution.cache_clear()
@@ -1,19 +1,46 @@
+from typing import Hashable, Optional, Sequence
+
 import numpy as np
 from arcade import SpriteList, color, shape_list
 
-from . import CARD_SCALE, CARD_SIZE, CARD_SPACING, SCREEN_SIZE, SEAT_PADDING
-from .utilities import centered_text
+from . import CARD_SIZE, CARD_SPACING, SCREEN_SIZE, SEAT_PADDING
+from .engine import HandValue, PlayerHand, card_points
+from .utilities import Label, LabelPool
+
+# where every card of a seat goes, relative to the seat's top-left corner at a
+# scale of 1: a row of six, with a second row of five tucked in under it
+_slots = np.arange(11)
+_second_row = _slots >= 6
+CARD_OFFSETS = np.stack(
+    [
+        np.where(_second_row, _slots - 5.5, _slots) * CARD_SPACING[0]
+        + SEAT_PADDING,
+        -(np.where(_second_row, CARD_SPACING[1], 0) + SEAT_PADDING),
+    ],
+    axis=1,
+)
 
 
 class Seat(SpriteList):
-    def __init__(self, window_width: int, window_height: int, **anchor):
+    def __init__(
+        self,
+        window_width: int,
+        window_height: int,
+        labels: LabelPool,
+        slot: Hashable,
+        **anchor,
+    ):
         super().__init__()
+        self.labels = labels
+        self.slot = slot
         self.scale_xy = [window_width, window_height] / SCREEN_SIZE
         self.scale = min(self.scale_xy)
-        self.card_anchors = [np.zeros(2) for _ in range(11)]
+        self.card_anchors = np.zeros((len(CARD_OFFSETS), 2))
         self.anchor = np.zeros(2)  # the top-left corner of the seat
         self.placemat: shape_list.Shape
         self.highlight: shape_list.Shape
+        self._hard_total = 0
+        self._aces = 0
 
         if "left" in anchor:
             self.anchor[0] = anchor["left"]
@@ -47,25 +74,50 @@ class Seat(SpriteList):
     def height(self):
         return self.scale * (CARD_SIZE[1] + CARD_SPACING[1] + 2 * SEAT_PADDING)
 
+    @property
+    def value(self) -> HandValue:
+        # the value of the cards that have actually landed in this seat, which
+        # may lag behind the engine's hand while cards are in flight; it is
+        # kept up to date as cards come and go, so reading it is cheap
+        return HandValue(self._hard_total, self._aces)
+
     @property
     def value_total(self):
-        total = 0
-        aces = 0
-        for card in self:
-            if card is None:
-                continue
-            if card.value == 1:
-                aces += 1
-            elif card.value >= 10:
-                total += 10
-            else:
-                total += card.value
-        if aces == 0:
-            return total
-        tmp = 11 + aces - 1
-        if tmp + total <= 21:
-            return tmp + total
-        return aces + total
+        return self.value.total
+
+    def _count(self, card, sign: int):
+        if card.value is None:
+            return
+        self._hard_total += sign * card_points(card.value)
+        if card.value == 1:
+            self._aces += sign
+
+    def append(self, card):
+        super().append(card)
+        self._count(card, 1)
+
+    def insert(self, index: int, card):
+        super().insert(index, card)
+        self._count(card, 1)
+
+    def remove(self, card):
+        super().remove(card)
+        self._count(card, -1)
+
+    def clear(self, deep: bool = True):
+        super().clear(deep)
+        self._hard_total = 0
+        self._aces = 0
+
+    def discard_cards(self):
+        # unlike ``clear``, this keeps the sprite list's buffers around
+        while self:
+            self.remove(self[-1])
+
+    def label(self, name: str) -> Label:
+        # labels belong to the seat's slot rather than to the seat itself, so
+        # they survive the seats being rebuilt every round
+        return self.labels[self.slot, name]
 
     def setup_rectangles(self):
         rect_kwargs = dict(
@@ -84,127 +136,118 @@ class Seat(SpriteList):
         )
 
     def anchor_cards(self):
-        for (left, top), card in zip(self.card_anchors, self):
-            card.scale = self.scale * CARD_SCALE
-            card.left = left
-            card.top = top
+        # cards fill their hit box, so their centers are half a card in from
+        # the anchors, and setting those skips working out the hit box
+        # the card textures are already CARD_SCALE of the source images
+        for (left, top), card in zip(self.card_anchors.tolist(), self):
+            card.scale = self.scale
+            card.position = left + card.width / 2, top - card.height / 2
 
     def on_resize(self, window_width, window_height):
-        self.anchor /= self.scale_xy
-        self.scale_xy = [window_width, window_height] / SCREEN_SIZE
-        self.anchor *= self.scale_xy
-        self.scale = min(self.scale_xy)
+        layout_seats([self], window_width, window_height)
 
-        for i, anchor in enumerate(self.card_anchors):
-            if i < 6:
-                self.card_anchors[i][0] = self.anchor[0] + self.scale * (
-                    i * CARD_SPACING[0] + SEAT_PADDING
-                )
-                self.card_anchors[i][1] = self.anchor[1] - self.scale * (
-                    SEAT_PADDING
-                )
-            else:
-                self.card_anchors[i][0] = self.anchor[0] + self.scale * (
-                    (i - 5.5) * CARD_SPACING[0] + SEAT_PADDING
-                )
-                self.card_anchors[i][1] = self.anchor[1] - self.scale * (
-                    CARD_SPACING[1] + SEAT_PADDING
-                )
-        self.setup_rectangles()
-        self.anchor_cards()
-
-    def on_draw(self, highlight: bool = False):
-        self.placemat.draw()
-        if highlight:
-            self.highlight.draw()
-        self.draw()
+    def on_draw(self):
+        # the placemat and the cards are drawn along with every other seat's,
+        # by ``Placemats`` and the deck; only the labels are left
+        pass
 
 
 class Dealer(Seat):
-    def will_stay(self):
-        if self.value_total < 17:
-            return False
-        return True
-
-    def on_draw(self, highlight: bool = False):
-        super().on_draw(highlight=highlight)
+    def on_draw(self):
         center_y = self.anchor[1] - self.scale * SEAT_PADDING / 2
-        centered_text(
+        self.label("total").update(
             self.value_total,
             start_x=self.anchor[0] + self.width / 2,
             start_y=center_y,
             color=color.WHITE,
-        ).draw()
+        )
 
 
 class Player(Seat):
-    def __init__(self, window_width, window_height, purse=1000, **anchor):
-        super().__init__(window_width, window_height, **anchor)
-        self.bet = 100
-        self.purse = purse
-        self.bet_resolved = None
-
-    def resolve_bet(self, dealer_total=None):
-        if self.bet_resolved:
-            return
-
-        value = self.value_total
-
-        # Black Jack is an auto-win condition
-        if value == 21 and len(self) == 2:
-            self.purse += int(1.5 * self.bet)
-            self.bet_resolved = "W"
-            return
-        # Bust is an auto lose condition
-        if value > 21:
-            self.purse -= self.bet
-            self.bet_resolved = "L"
-            return
-        # any other condition requires knowledge of the dealer's score
-        if dealer_total is None:
-            return
-
-        # we know the player hasn't busted, so...
-        if dealer_total > 21:
-            # the dealer busted, player wins
-            self.purse += self.bet
-            self.bet_resolved = "W"
-        elif dealer_total > value:
-            # the dealer has a higher score
-            self.purse -= self.bet
-            self.bet_resolved = "L"
-        elif value > dealer_total:
-            # the player has a higher score
-            self.purse += self.bet
-            self.bet_resolved = "W"
-        else:
-            # tie, aka "push"
-            self.bet_resolved = "T"
-
-    def on_draw(self, highlight):
-        super().on_draw(highlight)
+    def __init__(
+        self,
+        window_width,
+        window_height,
+        hand: PlayerHand,
+        labels: LabelPool,
+        slot: Hashable,
+        **anchor,
+    ):
+        super().__init__(window_width, window_height, labels, slot, **anchor)
+        self.hand = hand
+
+    def on_draw(self, hint: str = ""):
         purse_color = color.WHITE
-        if self.bet_resolved == "W":
+        if self.hand.bet_resolved == "W":
             purse_color = color.GREEN_YELLOW
-        elif self.bet_resolved == "L":
+        elif self.hand.bet_resolved == "L":
             purse_color = color.RED_ORANGE
 
         center_y = self.anchor[1] - self.scale * SEAT_PADDING / 2
-        centered_text(
-            self.purse,
+        self.label("purse").update(
+            self.hand.purse,
             start_x=self.anchor[0] + self.width / 4,
             start_y=center_y,
             color=purse_color,
-        ).draw()
-        centered_text(
+        )
+        self.label("total").update(
             self.value_total,
             start_x=self.anchor[0] + 2 * self.width / 4,
             start_y=center_y,
             color=color.WHITE,
-        ).draw()
-        centered_text(
-            self.bet,
+        )
+        self.label("bet").update(
+            self.hand.bet,
             start_x=self.anchor[0] + 3 * self.width / 4,
             start_y=center_y,
             color=color.WHITE,
-        ).draw()
+        )
+        self.label("hint").update(
+            hint,
+            start_x=self.anchor[0] + self.width / 2,
+            start_y=self.anchor[1] + self.scale * SEAT_PADDING,
+            color=color.YELLOW,
+        )
+
+
+def layout_seats(seats: Sequence[Seat], window_width, window_height):
+    # move every seat and the anchors of all of their cards to a new window
+    # size at once
+    if not seats:
+        return
+    scale_xy = [window_width, window_height] / SCREEN_SIZE
+    scale = min(scale_xy)
+    old_scale_xy = np.array([seat.scale_xy for seat in seats])
+    anchors = np.array([seat.anchor for seat in seats])
+    anchors *= scale_xy / old_scale_xy
+    card_anchors = anchors[:, np.newaxis] + scale * CARD_OFFSETS
+    for seat, anchor, cards in zip(seats, anchors, card_anchors):
+        seat.scale_xy = scale_xy
+        seat.scale = scale
+        seat.anchor = anchor
+        seat.card_anchors = cards
+        seat.setup_rectangles()
+        seat.anchor_cards()
+
+
+class Placemats(shape_list.ShapeElementList):
+    # The placemats of all seats and the outline around the one whose turn it
+    # is, drawn together as one batch. The batch is only rebuilt when the
+    # seats have been laid out again or the turn passes on.
+    def __init__(self):
+        super().__init__()
+        self.seats: list[Seat] = []
+        self.highlighted: Optional[int] = None
+
+    def build(self, seats: Sequence[Seat], highlighted: Optional[int] = None):
+        self.clear()
+        for seat in seats:
+            self.append(seat.placemat)
+        if highlighted is not None and highlighted < len(seats):
+            self.append(seats[highlighted].highlight)
+        self.seats = list(seats)
+        self.highlighted = highlighted
+
+    def highlight(self, highlighted: Optional[int]):
+        if highlighted != self.highlighted:
+            self.build(self.seats, highlighted)
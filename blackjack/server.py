@@ -0,0 +1,283 @@
+import argparse
+import asyncio
+import time
+from typing import Optional, Sequence
+
+from .engine import Card, Table
+from .policy import MimicDealer, Policy
+
+# Many tables played headless in one process, each as an asyncio task of its
+# own. A table goes through the same transitions as the game window, one per
+# tick, with the seats played by bots or by players connected through a pair
+# of bounded queues: actions in, events out. A table that has filled up the
+# event queue of one of its players waits for it to catch up, and a player
+# that keeps the table waiting too long for an action stands. Every turn is
+# numbered, and an action tagged with the number of a turn that is over is
+# dropped. A player that disconnects no longer holds up the table.
+#
+# Players can connect in-process through ``TableHost.connect``, or over a
+# local socket with a line based protocol: send ``JOIN <table> <seat>``, then
+# ``HIT <turn>`` or ``STAND <turn>`` whenever a ``TURN`` event comes in for
+# your seat, with the turn number it ends with. An action without a number
+# answers whichever turn is next.
+
+TICK = 1 / 60
+QUEUE_SIZE = 64
+ACTION_TIMEOUT = 30.0
+HIT = "HIT"
+STAND = "STAND"
+
+Event = tuple
+Action = tuple[str, Optional[int]]  # and the turn it answers, if given
+
+
+def card_name(card: Card) -> str:
+    # as in the names of the card images, e.g. 12H
+    suit, value = card
+    return f"{value}{suit}"
+
+
+def drain(queue: asyncio.Queue):
+    while not queue.empty():
+        queue.get_nowait()
+
+
+class Connection:
+    def __init__(self, queue_size: int = QUEUE_SIZE):
+        self.actions: asyncio.Queue[Action] = asyncio.Queue(queue_size)
+        self.events: asyncio.Queue[Event] = asyncio.Queue(queue_size)
+        self.closed = False
+
+    def close(self):
+        # nobody reads the events of a closed connection anymore, so empty
+        # the queue to wake up a table waiting to put one, and stand for a
+        # table waiting on an action
+        self.closed = True
+        drain(self.events)
+        drain(self.actions)
+        self.actions.put_nowait((STAND, None))
+
+    async def hit(self, turn: Optional[int] = None):
+        await self.actions.put((HIT, turn))
+
+    async def stand(self, turn: Optional[int] = None):
+        await self.actions.put((STAND, turn))
+
+    async def next_event(self) -> Event:
+        return await self.events.get()
+
+
+class TableHost:
+    def __init__(
+        self,
+        table_id: int,
+        num_players: int,
+        seed=None,
+        num_decks: int = 1,
+        bots: Optional[Sequence[Optional[Policy]]] = None,
+        tick: float = TICK,
+        action_timeout: float = ACTION_TIMEOUT,
+    ):
+        self.table_id = table_id
+        self.table = Table(num_players, seed=seed, num_decks=num_decks)
+        # a seat with neither a bot nor a connection stands on every turn
+        self.bots = list(bots) if bots else [None] * num_players
+        if len(self.bots) != num_players:
+            raise ValueError("bots must have one policy per player")
+        self.connections: list[Optional[Connection]] = [None] * num_players
+        self.tick = tick
+        self.action_timeout = action_timeout
+        self.rounds = 0
+        self.turns = 0  # numbers every TURN sent to a player
+        self.next_tick = 0.0
+
+    def connect(self, seat: int, queue_size: int = QUEUE_SIZE) -> Connection:
+        if not 0 <= seat < len(self.connections):
+            raise ValueError(f"there is no seat {seat}")
+        if self.bots[seat] is not None:
+            raise ValueError(f"seat {seat} is played by a bot")
+        if self.connections[seat] is not None:
+            raise ValueError(f"seat {seat} is taken")
+        connection = self.connections[seat] = Connection(queue_size)
+        return connection
+
+    def disconnect(self, seat: int):
+        connection = self.connections[seat]
+        if connection is not None:
+            connection.close()
+        self.connections[seat] = None
+
+    async def broadcast(self, *event):
+        for connection in self.connections:
+            if connection is not None and not connection.closed:
+                await connection.events.put(event)
+
+    async def wait_tick(self):
+        # ticks are kept to a fixed schedule rather than a fixed sleep, so a
+        # slow transition does not push back every one after it
+        loop = asyncio.get_running_loop()
+        self.next_tick = max(self.next_tick + self.tick, loop.time())
+        await asyncio.sleep(self.next_tick - loop.time())
+
+    async def decide(self, seat: int) -> bool:
+        player = self.table.players[seat]
+        bot = self.bots[seat]
+        if bot is not None:
+            return bot(player, self.table.upcard)
+        connection = self.connections[seat]
+        if connection is None or connection.closed:
+            return False
+        # anything sent since the last turn, e.g. an action that came in
+        # after it timed out, is not an answer to this one
+        drain(connection.actions)
+        self.turns += 1
+        turn = self.turns
+        await connection.events.put(
+            ("TURN", seat, player.total, self.table.upcard, turn)
+        )
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.action_timeout
+        while True:
+            try:
+                action, answers = await asyncio.wait_for(
+                    connection.actions.get(), deadline - loop.time()
+                )
+            except asyncio.TimeoutError:
+                return False
+            # an action for an earlier turn may still come in during this one
+            if answers is None or answers == turn:
+                return action == HIT
+
+    async def play_round(self):
+        table = self.table
+        dealt = table.new_round()
+        await self.broadcast("ROUND", self.rounds)
+        for i, (hand, card) in enumerate(dealt):
+            if hand is table.dealer:
+                # the dealer's hole card is dealt face down
+                name = card_name(card) if i < len(dealt) - 1 else "??"
+                await self.broadcast("DEALER", name)
+            else:
+                seat = table.players.index(hand)
+                await self.broadcast("DEAL", seat, card_name(card))
+
+        while not table.round_over:
+            await self.wait_tick()
+            hole_card_seen = table.hole_card_seen
+            card = table.advance()
+            if table.hole_card_seen and not hole_card_seen:
+                await self.broadcast(
+                    "REVEAL", card_name(table.dealer.cards[1])
+                )
+            if card is not None:
+                await self.broadcast("DEALER", card_name(card))
+            elif not table.round_over:
+                seat = table.player_idx
+                if await self.decide(seat):
+                    await self.broadcast("DEAL", seat, card_name(table.hit()))
+                else:
+                    table.stand()
+
+        for seat, player in enumerate(table.players):
+            await self.broadcast(
+                "RESULT", seat, player.bet_resolved or "-", player.purse
+            )
+        self.rounds += 1
+
+    async def run(self, max_rounds: Optional[int] = None):
+        self.next_tick = asyncio.get_running_loop().time()
+        while max_rounds is None or self.rounds < max_rounds:
+            await self.play_round()
+
+
+class GameServer:
+    def __init__(self):
+        self.tables: dict[int, TableHost] = {}
+
+    def add_table(self, num_players: int, **kwargs) -> TableHost:
+        table_id = len(self.tables)
+        host = self.tables[table_id] = TableHost(
+            table_id, num_players, **kwargs
+        )
+        return host
+
+    async def run(self, max_rounds: Optional[int] = None):
+        await asyncio.gather(
+            *(host.run(max_rounds) for host in self.tables.values())
+        )
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 0):
+        return await asyncio.start_server(self.handle_client, host, port)
+
+    async def handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        try:
+            words = (await reader.readline()).decode().split()
+            if len(words) != 3 or words[0] != "JOIN":
+                raise ValueError("expected JOIN <table> <seat>")
+            table = self.tables[int(words[1])]
+            seat = int(words[2])
+            connection = table.connect(seat)
+        except (KeyError, IndexError, ValueError) as e:
+            writer.write(f"ERROR {e}\n".encode())
+            await writer.drain()
+            writer.close()
+            return
+
+        async def send_events():
+            while True:
+                event = await connection.next_event()
+                writer.write((" ".join(map(str, event)) + "\n").encode())
+                # a slow reader holds up its table through the event queue
+                await writer.drain()
+
+        sender = asyncio.create_task(send_events())
+        try:
+            while line := await reader.readline():
+                words = line.decode().upper().split()
+                if not words or words[0] not in (HIT, STAND):
+                    continue
+                turn = None
+                if len(words) > 1 and words[1].isdigit():
+                    turn = int(words[1])
+                await connection.actions.put((words[0], turn))
+        finally:
+            sender.cancel()
+            table.disconnect(seat)
+            writer.close()
+
+
+async def main(args: argparse.Namespace):
+    server = GameServer()
+    for i in range(args.tables):
+        server.add_table(
+            args.players,
+            seed=None if args.seed is None else args.seed + i,
+            num_decks=args.decks,
+            bots=[MimicDealer()] * args.players if args.bots else None,
+            tick=args.tick,
+        )
+    if args.port is not None:
+        listener = await server.serve(port=args.port)
+        print("listening on", listener.sockets[0].getsockname())
+    start = time.perf_counter()
+    await server.run(args.rounds)
+    elapsed = time.perf_counter() - start
+    rounds = sum(host.rounds for host in server.tables.values())
+    print(f"{rounds} rounds in {elapsed:.2f}s ({rounds / elapsed:.0f}/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="headless blackjack tables")
+    parser.add_argument("--tables", type=int, default=100)
+    parser.add_argument("--players", type=int, default=3)
+    parser.add_argument("--decks", type=int, default=1)
+    parser.add_argument("--rounds", type=int, help="rounds to play per table")
+    parser.add_argument("--tick", type=float, default=TICK)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--port", type=int, help="accept players on this port")
+    parser.add_argument(
+        "--bots", action="store_true", help="fill every seat with a bot"
+    )
+    asyncio.run(main(parser.parse_args()))
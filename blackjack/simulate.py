@@ -0,0 +1,145 @@
+from typing import TYPE_CHECKING, Callable, NamedTuple, Optional, Union
+
+import numpy as np
+
+from .engine import BLACKJACK, DEALER_STANDS_ON, VALUES
+
+if TYPE_CHECKING:
+    from .policy import Policy
+
+# Batch simulation of whole rounds as NumPy arrays, one row per round. Cards
+# are drawn from an infinite shoe (every rank equally likely on every draw),
+# which is what makes the rounds independent of each other and lets every
+# round advance in lock-step.
+
+WIN = 1
+PUSH = 0
+LOSS = -1
+OUTCOME_CODES = {WIN: "W", PUSH: "T", LOSS: "L"}
+
+# a policy is a boolean "hit?" lookup table indexed by
+# [soft, player total, dealer upcard points], aces counting as 1 for the
+# upcard, or anything with the batched ``decide`` of ``policy.Policy``
+POLICY_SHAPE = (2, BLACKJACK + 1, 11)
+
+
+def dealer_policy() -> np.ndarray:
+    # hit on anything below what the dealer stands on, regardless of upcard
+    policy = np.zeros(POLICY_SHAPE, dtype=bool)
+    policy[:, :DEALER_STANDS_ON, :] = True
+    return policy
+
+
+def draw_ranks(rng: np.random.Generator, size) -> np.ndarray:
+    return rng.integers(VALUES[0], VALUES[-1] + 1, size=size, dtype=np.int8)
+
+
+def rank_points(ranks: np.ndarray) -> np.ndarray:
+    return np.minimum(ranks, 10)
+
+
+def hand_totals(hard: np.ndarray, aces: np.ndarray):
+    # the vectorized equivalent of ``engine.Hand.total`` and ``Hand.soft``
+    soft = (aces > 0) & (hard + 10 <= BLACKJACK)
+    return np.where(soft, hard + 10, hard), soft
+
+
+class RoundResults(NamedTuple):
+    outcomes: np.ndarray  # WIN, PUSH or LOSS per round
+    deltas: np.ndarray  # change in the purse per round
+    player_totals: np.ndarray
+    dealer_totals: np.ndarray
+    blackjacks: np.ndarray
+
+
+def simulate_rounds(
+    num_rounds: int,
+    policy: Union[np.ndarray, "Policy", None] = None,
+    bet: int = 100,
+    rng: Optional[np.random.Generator] = None,
+    draw: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+) -> RoundResults:
+    # ``draw(rows)`` deals one card for each of the given rounds, for when
+    # they are dealt from shoes of their own instead of the infinite one
+    if policy is None:
+        policy = dealer_policy()
+    if isinstance(policy, np.ndarray) and policy.shape != POLICY_SHAPE:
+        raise ValueError(f"policy must have shape {POLICY_SHAPE}")
+    if rng is None:
+        rng = np.random.default_rng()
+
+    # deal two cards to the player and two to the dealer
+    if draw is None:
+        player = draw_ranks(rng, (num_rounds, 2))
+        dealer = draw_ranks(rng, (num_rounds, 2))
+
+        def draw(rows: np.ndarray) -> np.ndarray:
+            return draw_ranks(rng, rows.size)
+
+    else:
+        everyone = np.arange(num_rounds)
+        first, up, second, hole = [draw(everyone) for _ in range(4)]
+        player = np.stack([first, second], axis=1)
+        dealer = np.stack([up, hole], axis=1)
+    upcard = rank_points(dealer[:, 0])
+
+    player_hard = rank_points(player).sum(axis=1, dtype=np.int16)
+    player_aces = (player == 1).sum(axis=1, dtype=np.int16)
+    player_total, player_soft = hand_totals(player_hard, player_aces)
+    blackjacks = player_total == BLACKJACK
+
+    # the player keeps drawing while they are under 21 and the policy says so
+    active = np.flatnonzero(player_total < BLACKJACK)
+    while active.size:
+        if isinstance(policy, np.ndarray):
+            hit = policy[
+                player_soft[active].astype(np.intp),
+                player_total[active],
+                upcard[active],
+            ]
+        else:
+            hit = policy.decide(
+                player_soft[active], player_total[active], upcard[active]
+            )
+        active = active[hit]
+        if not active.size:
+            break
+        card = draw(active)
+        player_hard[active] += rank_points(card)
+        player_aces[active] += card == 1
+        total, soft = hand_totals(player_hard[active], player_aces[active])
+        player_total[active] = total
+        player_soft[active] = soft
+        active = active[total < BLACKJACK]
+
+    # the dealer draws until they reach 17
+    dealer_hard = rank_points(dealer).sum(axis=1, dtype=np.int16)
+    dealer_aces = (dealer == 1).sum(axis=1, dtype=np.int16)
+    dealer_total, _ = hand_totals(dealer_hard, dealer_aces)
+    active = np.flatnonzero(dealer_total < DEALER_STANDS_ON)
+    while active.size:
+        card = draw(active)
+        dealer_hard[active] += rank_points(card)
+        dealer_aces[active] += card == 1
+        total, _ = hand_totals(dealer_hard[active], dealer_aces[active])
+        dealer_total[active] = total
+        active = active[total < DEALER_STANDS_ON]
+
+    # settle the bets the same way ``engine.PlayerHand.resolve_bet`` does
+    outcomes = np.select(
+        [
+            blackjacks,
+            player_total > BLACKJACK,
+            dealer_total > BLACKJACK,
+            dealer_total > player_total,
+            player_total > dealer_total,
+        ],
+        [WIN, LOSS, WIN, LOSS, WIN],
+        PUSH,
+    ).astype(np.int8)
+    deltas = outcomes.astype(np.int64) * bet
+    deltas[blackjacks] = int(1.5 * bet)
+
+    return RoundResults(
+        outcomes, deltas, player_total, dealer_total, blackjacks
+    )
@@ -0,0 +1,148 @@
+import math
+from statistics import NormalDist
+from typing import Sequence
+
+import numpy as np
+
+from .engine import BLACKJACK, Table
+from .simulate import LOSS, PUSH, WIN, RoundResults
+
+# Running statistics of played hands, accumulated as they come rather than
+# kept around: the mean and variance of the purse delta with Welford's method,
+# and plain counters for everything else. Two sets of statistics gathered
+# separately, e.g. by different workers, merge into the statistics of both
+# (Chan et al.'s pairwise update), so a run can be split up any which way.
+
+RESULT_CODES = {"W": WIN, "T": PUSH, "L": LOSS}
+
+
+class RunningStats:
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0  # of the purse delta per hand
+        self.m2 = 0.0  # sum of squared differences from the mean
+        self.net = 0  # the exact sum of the deltas
+        self.wins = 0
+        self.losses = 0
+        self.pushes = 0
+        self.blackjacks = 0
+        self.dealer_busts = 0
+
+    def __repr__(self):
+        return (
+            f"RunningStats(count={self.count}, mean={self.mean:.4f}, "
+            f"stderr={self.stderr:.4f})"
+        )
+
+    def add(
+        self, delta: float, outcome: int, blackjack: bool, dealer_bust: bool
+    ):
+        self.count += 1
+        self.net += delta
+        diff = delta - self.mean
+        self.mean += diff / self.count
+        self.m2 += diff * (delta - self.mean)
+        self.wins += outcome == WIN
+        self.losses += outcome == LOSS
+        self.pushes += outcome == PUSH
+        self.blackjacks += bool(blackjack)
+        self.dealer_busts += bool(dealer_bust)
+
+    def add_results(self, results: RoundResults):
+        # a batch from ``simulate.simulate_rounds``
+        batch = RunningStats()
+        deltas = results.deltas.astype(np.float64)
+        batch.count = len(deltas)
+        batch.net = int(results.deltas.sum())
+        if batch.count:
+            batch.mean = float(deltas.mean())
+            batch.m2 = float(np.square(deltas - batch.mean).sum())
+        outcomes = results.outcomes
+        batch.wins = int(np.count_nonzero(outcomes == WIN))
+        batch.losses = int(np.count_nonzero(outcomes == LOSS))
+        batch.pushes = int(np.count_nonzero(outcomes == PUSH))
+        batch.blackjacks = int(np.count_nonzero(results.blackjacks))
+        batch.dealer_busts = int(
+            np.count_nonzero(results.dealer_totals > BLACKJACK)
+        )
+        self.merge(batch)
+
+    def add_table(self, table: Table, purses: Sequence[int]):
+        # a finished round of ``engine.Table``, given the purses before it;
+        # players who were broke going in sat it out and are left out, even
+        # though the table still settles their bet against the dealer
+        dealer_bust = table.dealer.busted
+        for player, purse in zip(table.players, purses):
+            if purse <= 0 or not player.bet_resolved:
+                continue
+            self.add(
+                player.purse - purse,
+                RESULT_CODES[player.bet_resolved],
+                player.is_blackjack,
+                dealer_bust,
+            )
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        count = self.count + other.count
+        if other.count:
+            diff = other.mean - self.mean
+            self.mean += diff * other.count / count
+            self.m2 += other.m2 + diff**2 * self.count * other.count / count
+        self.count = count
+        self.net += other.net
+        self.wins += other.wins
+        self.losses += other.losses
+        self.pushes += other.pushes
+        self.blackjacks += other.blackjacks
+        self.dealer_busts += other.dealer_busts
+        return self
+
+    @property
+    def variance(self) -> float:
+        if self.count < 2:
+            return math.inf
+        return self.m2 / (self.count - 1)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def stderr(self) -> float:
+        if self.count < 2:
+            return math.inf
+        return math.sqrt(self.variance / self.count)
+
+    def rate(self, counter: int) -> float:
+        return counter / self.count if self.count else math.nan
+
+    @property
+    def win_rate(self) -> float:
+        return self.rate(self.wins)
+
+    @property
+    def loss_rate(self) -> float:
+        return self.rate(self.losses)
+
+    @property
+    def push_rate(self) -> float:
+        return self.rate(self.pushes)
+
+    @property
+    def blackjack_rate(self) -> float:
+        return self.rate(self.blackjacks)
+
+    @property
+    def dealer_bust_rate(self) -> float:
+        return self.rate(self.dealer_busts)
+
+    def half_width(self, confidence: float = 0.95) -> float:
+        # of the normal confidence interval around the mean delta
+        z = NormalDist().inv_cdf((1 + confidence) / 2)
+        return z * self.stderr
+
+    def confidence_interval(
+        self, confidence: float = 0.95
+    ) -> tuple[float, float]:
+        half_width = self.half_width(confidence)
+        return self.mean - half_width, self.mean + half_width
@@ -0,0 +1,114 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from .cache import CACHE_DIR, write_atomic
+from .engine import BLACKJACK, HandValue
+from .policy import TablePolicy
+from .probability import BUST, FINAL_TOTALS, FULL_DECK, dealer_distribution
+
+# Expected value, per unit bet, of standing or hitting for every player
+# total (hard and soft) against every dealer upcard. The tables only depend
+# on the number of decks, so they are generated once, saved as .npy files in
+# the cache directory and memory-mapped by every process that needs them.
+#
+# The table is indexed [soft, player total, dealer upcard points, action],
+# matching ``simulate.POLICY_SHAPE`` plus the action, with aces counted as 1
+# for the upcard. Blackjacks are settled before any decision, so only even
+# money wins, losses and pushes come into it.
+
+STAND = 0
+HIT = 1
+TABLE_VERSION = 1
+TABLE_SHAPE = (2, BLACKJACK + 1, 11, 2)
+
+
+def _stand_values(distribution: np.ndarray) -> np.ndarray:
+    # the value of standing on every total from 0 to 21
+    values = np.empty(BLACKJACK + 1)
+    finals = np.array(FINAL_TOTALS)
+    for total in range(BLACKJACK + 1):
+        below = distribution[:BUST][finals < total].sum()
+        above = distribution[:BUST][finals > total].sum()
+        values[total] = distribution[BUST] + below - above
+    return values
+
+
+def generate(num_decks: int = 1) -> np.ndarray:
+    table = np.zeros(TABLE_SHAPE)
+    shoe = np.array(FULL_DECK) * num_decks
+    for upcard in range(1, 11):
+        composition = shoe.copy()
+        composition[upcard - 1] -= 1
+        stand = _stand_values(
+            dealer_distribution(upcard, composition, num_decks)
+        )
+        draw = composition / composition.sum()
+
+        @lru_cache(maxsize=None)
+        def best(hard_total: int, aces: bool) -> float:
+            value = HandValue(hard_total, int(aces))
+            if value.total > BLACKJACK:
+                return -1.0
+            if value.total == BLACKJACK:
+                # the engine never lets a player hit on 21
+                return stand[BLACKJACK]
+            return max(stand[value.total], hit(hard_total, aces))
+
+        @lru_cache(maxsize=None)
+        def hit(hard_total: int, aces: bool) -> float:
+            return sum(
+                p * best(hard_total + points, aces or points == 1)
+                for points, p in enumerate(draw, start=1)
+            )
+
+        for total in range(BLACKJACK + 1):
+            table[0, total, upcard] = stand[total], hit(total, False)
+            if total >= 12:
+                table[1, total, upcard] = stand[total], hit(total - 10, True)
+    return table
+
+
+def table_path(num_decks: int = 1, cache_dir: str = CACHE_DIR) -> str:
+    return os.path.join(
+        cache_dir, f"strategy-v{TABLE_VERSION}-{num_decks}deck.npy"
+    )
+
+
+def load(num_decks: int = 1, cache_dir: str = CACHE_DIR) -> np.ndarray:
+    path = table_path(num_decks, cache_dir)
+    try:
+        return np.load(path, mmap_mode="r")
+    except (OSError, ValueError):
+        pass
+    table = generate(num_decks)
+    try:
+        write_atomic(path, lambda f: np.save(f, table))
+    except OSError:
+        # without a writable cache, every process generates its own table
+        return table
+    return np.load(path, mmap_mode="r")
+
+
+def hit_policy(table: np.ndarray) -> np.ndarray:
+    # the lookup table ``simulate.simulate_rounds`` plays from
+    return table[..., HIT] > table[..., STAND]
+
+
+class BasicStrategy(TablePolicy):
+    # plays whichever action has the higher expected value
+    def __init__(self, num_decks: int = 1, ev: np.ndarray = None):
+        self.ev = load(num_decks) if ev is None else ev
+        super().__init__(hit_policy(self.ev))
+
+    def values(self, value: HandValue, upcard: int) -> np.ndarray:
+        return self.ev[int(value.soft), value.total, min(upcard, 10)]
+
+    def hint(self, value: HandValue, upcard: int) -> str:
+        if value.total >= BLACKJACK:
+            return ""
+        stand, hit = self.values(value, upcard)
+        if hit > stand:
+            return f"HIT ({hit:+.2f})"
+        return f"STAND ({stand:+.2f})"
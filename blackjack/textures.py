@@ -1,26 +1,89 @@
 import itertools as it
 import os
+from collections.abc import Mapping
+from typing import Hashable, Optional
 
 import arcade
+import PIL.Image
 
-ASSETS = os.path.join(os.path.dirname(__file__), "assets")
-
-CARD_BACKS: dict[str, arcade.texture.Texture] = {
-    name: arcade.load_texture(
-        os.path.join(ASSETS, f"cards/backs/{name}.png"),
-        hit_box_algorithm=None,
-    )
-    for name in ["red", "blue"]
-}
-CARD_FACES: dict[tuple[str, int], arcade.texture.Texture] = {
-    (suit, value): arcade.load_texture(
-        os.path.join(ASSETS, f"cards/faces/{value}{suit}.png"),
-        hit_box_algorithm=None,
-    )
-    for (suit, value) in it.product(
-        ["S", "H", "C", "D"], range(1, 14)
-    )
-}
-TABLE = arcade.load_texture(
-    os.path.join(ASSETS, "felt_green.jpg"), hit_box_algorithm=None
+from . import ASSETS, atlas
+from .engine import SUITS, VALUES
+
+
+class LazyTextures(Mapping):
+    # textures are only decoded the first time they are looked up, so that
+    # importing this module (or a process that never draws) stays cheap
+    def __init__(self, paths: dict[Hashable, str]):
+        self.paths = paths
+        self.loaded: dict[Hashable, arcade.texture.Texture] = {}
+
+    def __getitem__(self, key: Hashable) -> arcade.texture.Texture:
+        try:
+            return self.loaded[key]
+        except KeyError:
+            pass
+        texture = self.loaded[key] = self.load(key)
+        return texture
+
+    def __iter__(self):
+        return iter(self.paths)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def load(self, key: Hashable) -> arcade.texture.Texture:
+        return arcade.load_texture(self.paths[key], hit_box_algorithm=None)
+
+
+class AtlasTextures(LazyTextures):
+    # the card images all come out of the one packed atlas image, which is
+    # decoded once and shared by every instance. Every crop is a copy, so
+    # the atlas is let go of once none of its cards are left to crop.
+    _atlas: Optional[tuple[PIL.Image.Image, dict[str, atlas.Rect], str]] = None
+    _uncropped: set[str] = set()
+
+    def __init__(self, paths: dict[Hashable, str]):
+        super().__init__(paths)
+        AtlasTextures._uncropped.update(
+            os.path.relpath(path, ASSETS) for path in paths.values()
+        )
+
+    def load(self, key: Hashable) -> arcade.texture.Texture:
+        if AtlasTextures._atlas is None:
+            AtlasTextures._atlas = atlas.load_atlas()
+        image, index, digest = AtlasTextures._atlas
+        asset = os.path.relpath(self.paths[key], ASSETS)
+        left, top, width, height = index[asset]
+        # the atlas digest already identifies the pixels, so spare arcade
+        # from hashing every card image again
+        texture = arcade.Texture(
+            image.crop((left, top, left + width, top + height)),
+            hit_box_algorithm=arcade.hitbox.algo_bounding_box,
+            hash=f"{digest}:{asset}",
+        )
+        AtlasTextures._uncropped.discard(asset)
+        if not AtlasTextures._uncropped:
+            AtlasTextures._atlas = None
+        return texture
+
+
+CARD_BACKS: AtlasTextures = AtlasTextures(
+    {
+        name: os.path.join(ASSETS, f"cards/backs/{name}.png")
+        for name in ["red", "blue"]
+    }
 )
+CARD_FACES: AtlasTextures = AtlasTextures(
+    {
+        (suit, value): os.path.join(ASSETS, f"cards/faces/{value}{suit}.png")
+        for (suit, value) in it.product(SUITS, VALUES)
+    }
+)
+_TABLES = LazyTextures({"felt": os.path.join(ASSETS, "felt_green.jpg")})
+
+
+def __getattr__(name: str):
+    # ``TABLE`` is looked up lazily too, via the module-level __getattr__
+    if name == "TABLE":
+        return _TABLES["felt"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,8 +1,12 @@
 import itertools as it
+import math
 from collections import deque
-from typing import Any
+from contextlib import contextmanager
+from typing import Any, Callable, Hashable, Optional
 
-from arcade import Text, color, easing
+import numpy as np
+import pyglet
+from arcade import Text, Window, color, easing, get_window
 
 
 def centered_text(
@@ -28,30 +32,334 @@ def centered_text(
     )
 
 
+class Label:
+    created = 0  # text objects made by every label so far
+
+    def __init__(self, batch: pyglet.graphics.Batch = None):
+        self.text = centered_text("", 0, 0, batch=batch)
+        Label.created += 1
+        self.state: tuple = (None, None, None)
+
+    def update(self, contents, start_x, start_y, color=color.WHITE) -> bool:
+        # only touch the pyglet layout for the parts that actually changed
+        value = str(contents)
+        position = (float(start_x), float(start_y))
+        rgba = tuple(color)
+        if (value, position, rgba) == self.state:
+            return False
+        old_value, old_position, old_rgba = self.state
+        if value != old_value:
+            self.text.value = value
+        if position != old_position:
+            self.text.position = position
+        if rgba != old_rgba:
+            self.text.color = rgba
+        self.state = (value, position, rgba)
+        return True
+
+
+class LabelPool(dict[Hashable, Label]):
+    # labels are created the first time their key is asked for and are then
+    # reused for as long as the pool lives, all of them drawn as one batch
+    def __init__(self):
+        super().__init__()
+        self.batch = pyglet.graphics.Batch()
+
+    def __missing__(self, key: Hashable) -> Label:
+        label = self[key] = Label(self.batch)
+        return label
+
+    def draw(self):
+        with get_window().ctx.pyglet_rendering():
+            self.batch.draw()
+
+
+class FrameCache:
+    # The last frame drawn, kept in a texture of its own, so that a frame in
+    # which nothing has changed can be put back on screen with a single blit
+    # rather than drawn all over again.
+    def __init__(self, window: Window):
+        self.window = window
+        self.framebuffer = None
+        self.valid = False
+
+    @property
+    def stale(self) -> bool:
+        # nothing has been kept, or not at the window's current size
+        return (
+            not self.valid
+            or self.framebuffer.size != self.window.get_framebuffer_size()
+        )
+
+    def invalidate(self):
+        self.valid = False
+
+    @contextmanager
+    def redraw(self):
+        ctx = self.window.ctx
+        size = self.window.get_framebuffer_size()
+        if self.framebuffer is None or self.framebuffer.size != size:
+            self.framebuffer = ctx.framebuffer(
+                color_attachments=[ctx.texture(size, components=4)]
+            )
+        with self.framebuffer.activate():
+            self.framebuffer.clear()
+            yield
+        self.valid = True
+
+    def present(self):
+        ctx = self.window.ctx
+        ctx.copy_framebuffer(self.framebuffer, ctx.screen)
+
+
+def _ease_in_out(percent: np.ndarray) -> np.ndarray:
+    return np.where(
+        percent < 0.5, 2 * percent**2, 1 - (-2 * percent + 2) ** 2 / 2
+    )
+
+
+def _ease_out_elastic(percent: np.ndarray) -> np.ndarray:
+    c4 = 2 * np.pi / 3
+    result = 2 ** (-10 * percent) * np.sin((percent * 10 - 0.75) * c4) + 1
+    return np.where(percent >= 1, 1.0, np.where(percent > 0, result, 0.0))
+
+
+def _ease_out_bounce(percent: np.ndarray) -> np.ndarray:
+    n1 = 7.5625
+    d1 = 2.75
+    return np.select(
+        [percent < 1 / d1, percent < 2 / d1, percent < 2.5 / d1],
+        [
+            n1 * percent**2,
+            n1 * (percent - 1.5 / d1) ** 2 + 0.75,
+            n1 * (percent - 2.25 / d1) ** 2 + 0.9375,
+        ],
+        n1 * (percent - 2.625 / d1) ** 2 + 0.984375,
+    )
+
+
+# vectorized versions of the arcade easing functions, looked up by the
+# function a tween was created with; anything else gets wrapped on first use
+_EASE_FUNCTIONS: list[Callable[[np.ndarray], np.ndarray]] = [
+    lambda p: p,
+    lambda p: p**2 * (3.0 - 2.0 * p),
+    lambda p: p**2,
+    lambda p: 1.0 - (1.0 - p) ** 2,
+    _ease_in_out,
+    _ease_out_elastic,
+    _ease_out_bounce,
+    lambda p: 2.70158 * p**3 - 1.70158 * p**2,
+    lambda p: 1 + 2.70158 * (p - 1) ** 3 + 1.70158 * (p - 1) ** 2,
+    lambda p: 1 - np.cos(p * np.pi / 2),
+    lambda p: np.sin(p * np.pi / 2),
+    lambda p: -np.cos(p * np.pi) * 0.5 + 0.5,
+]
+_EASE_IDS: dict[Callable, int] = {
+    func: i
+    for i, func in enumerate(
+        [
+            easing.linear,
+            easing.smoothstep,
+            easing.ease_in,
+            easing.ease_out,
+            easing.ease_in_out,
+            easing.ease_out_elastic,
+            easing.ease_out_bounce,
+            easing.ease_in_back,
+            easing.ease_out_back,
+            easing.ease_in_sin,
+            easing.ease_out_sin,
+            easing.ease_in_out_sin,
+        ]
+    )
+}
+
+
+def _ease_id(func: Callable) -> int:
+    try:
+        return _EASE_IDS[func]
+    except KeyError:
+        pass
+    vectorized = np.frompyfunc(func, 1, 1)
+    _EASE_FUNCTIONS.append(lambda p: vectorized(p).astype(float))
+    ease_id = _EASE_IDS[func] = len(_EASE_FUNCTIONS) - 1
+    return ease_id
+
+
+class AnimationIndex:
+    # Reference counts of the objects that still have tweens or function
+    # calls pending, so "is this animating?" never has to look through the
+    # queue. Objects are keyed by id, which is safe because the queue keeps a
+    # reference to each of them for as long as they are counted.
+    def __init__(self):
+        self.counts: dict[int, int] = {}
+        self.callbacks: dict[int, list[Callable[[Any], None]]] = {}
+
+    def __contains__(self, obj: Any) -> bool:
+        return id(obj) in self.counts
+
+    def __len__(self):
+        return len(self.counts)
+
+    def add(self, obj: Any):
+        key = id(obj)
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def discard(self, obj: Any):
+        key = id(obj)
+        count = self.counts[key] - 1
+        if count:
+            self.counts[key] = count
+            return
+        del self.counts[key]
+        for callback in self.callbacks.pop(key, []):
+            callback(obj)
+
+    def on_finished(self, obj: Any, callback: Callable[[Any], None]):
+        # call back once everything queued for ``obj`` is done, which may be
+        # right away
+        if obj not in self:
+            callback(obj)
+            return
+        self.callbacks.setdefault(id(obj), []).append(callback)
+
+
+class TweenArrays:
+    # Every tween lives in one row of a few NumPy arrays, so that all of the
+    # tweens that are running can be advanced in a single step. The objects
+    # and attributes being tweened are kept alongside, in ``targets``.
+    START, END, ELAPSED, DURATION, START_TIME = range(5)
+
+    def __init__(self, capacity: int = 64):
+        self.size = 0
+        self.values = np.zeros((capacity, 5))
+        self.ease_id = np.zeros(capacity, dtype=np.intp)
+        self.done = np.zeros(capacity, dtype=bool)
+        self.targets: list[tuple[Any, str]] = []
+        self.animating = AnimationIndex()
+
+    def __len__(self):
+        return self.size
+
+    def add(
+        self, obj: Any, attribute: str, data: easing.EasingData, start: float
+    ) -> int:
+        if self.size == len(self.done):
+            self.values = np.concatenate([self.values, self.values])
+            self.ease_id = np.concatenate([self.ease_id, self.ease_id])
+            self.done = np.concatenate([self.done, self.done])
+        row = self.size
+        self.values[row] = (
+            data.start_value,
+            data.end_value,
+            data.cur_period,
+            data.end_period,
+            start,
+        )
+        self.ease_id[row] = _ease_id(data.ease_function)
+        self.done[row] = False
+        self.targets.append((obj, attribute))
+        self.animating.add(obj)
+        self.size += 1
+        return row
+
+    def drop(self, count: int):
+        # forget the first ``count`` rows, which must all be finished
+        keep = slice(count, self.size)
+        for column in (self.values, self.ease_id, self.done):
+            column[: self.size - count] = column[keep]
+        del self.targets[:count]
+        self.size -= count
+
+    def step(self, rows, elapsed_time: float, delta_time: float) -> int:
+        # advance the given rows (a slice, or an array of row numbers) by one
+        # frame and write the new values back to their targets; returns how
+        # many of them finished
+        values = self.values[rows]
+        live = ~self.done[rows] & (values[:, self.START_TIME] <= elapsed_time)
+        if isinstance(rows, slice) and live.all():
+            numbers = range(rows.start, rows.stop)
+        else:
+            rows = np.arange(len(self.done))[rows][live]
+            numbers = rows.tolist()
+            if not numbers:
+                return 0
+            values = self.values[rows]
+
+        start, end, elapsed, duration, _ = values.T
+        elapsed = np.minimum(elapsed + delta_time, duration)
+        self.values[rows, self.ELAPSED] = elapsed
+        zero = duration == 0
+        percent = elapsed / np.where(zero, 1.0, duration)
+        percent[zero] = 1.0
+
+        ease_ids = self.ease_id[rows]
+        first = ease_ids[0]
+        if (ease_ids == first).all():
+            eased = _EASE_FUNCTIONS[first](percent)
+        else:
+            eased = np.empty_like(percent)
+            for ease_id in np.unique(ease_ids):
+                mask = ease_ids == ease_id
+                eased[mask] = _EASE_FUNCTIONS[ease_id](percent[mask])
+        current = start + (end - start) * eased
+
+        # occasionally, we don't line up just right due to rounding errors, so
+        # finished tweens land exactly on their end value
+        finished = percent >= 1.0
+        count = int(np.count_nonzero(finished))
+        if count:
+            current[finished] = end[finished]
+            done = self.done[rows]
+            done[finished] = True
+            self.done[rows] = done
+
+        targets = self.targets
+        for row, value in zip(numbers, current.tolist()):
+            obj, attr = targets[row]
+            setattr(obj, attr, value)
+        if count:
+            for row in np.asarray(numbers)[finished].tolist():
+                self.animating.discard(targets[row][0])
+        return count
+
+
 class ParallelEasing:
-    def __init__(self, start_time: float = 0.0):
+    def __init__(
+        self, start_time: float = 0.0, tweens: Optional[TweenArrays] = None
+    ):
         self.start_time = start_time
         self.elapsed_time = 0.0
-        self.easing_data: deque[
-            tuple[float, Any, str, easing.EasingData]
-        ] = deque([])
-        self.function_data: deque[tuple[float, Any, str, tuple, dict]] = deque(
-            []
-        )
+        self.tweens = TweenArrays() if tweens is None else tweens
+        self.rows: list[int] = []
+        self._rows = slice(0, 0)
+        self.pending = 0
+        self.function_data: list[tuple[float, Any, str, tuple, dict]] = []
 
     @property
     def finished(self):
-        return len(self.easing_data) == 0 and len(self.function_data) == 0
+        return self.pending == 0 and len(self.function_data) == 0
 
     @property
     def objects(self):
-        return [
-            item[1] for item in it.chain(self.easing_data, self.function_data)
+        targets = self.tweens.targets
+        done = self.tweens.done
+        return [targets[row][0] for row in self.rows if not done[row]] + [
+            item[1] for item in self.function_data
         ]
 
     def reset(self):
         self.elapsed_time = 0.0
-        self.easing_data = []
+        animating = self.tweens.animating
+        for row in self.rows:
+            if not self.tweens.done[row]:
+                animating.discard(self.tweens.targets[row][0])
+        for item in self.function_data:
+            animating.discard(item[1])
+        self.tweens.done[self.rows] = True
+        self.rows = []
+        self._rows = slice(0, 0)
+        self.pending = 0
         self.function_data = []
 
     def add_easing_data(
@@ -61,9 +369,12 @@ class ParallelEasing:
         easing_data: easing.EasingData,
         delay: float = 0.0,
     ):
-        self.easing_data.append(
-            (self.start_time + delay, obj, attribute, easing_data)
+        row = self.tweens.add(
+            obj, attribute, easing_data, self.start_time + delay
         )
+        self.rows.append(row)
+        self._rows = None
+        self.pending += 1
 
     def add_function_data(
         self,
@@ -76,34 +387,45 @@ class ParallelEasing:
         self.function_data.append(
             (self.start_time + delay, obj, function_name, args, kwargs)
         )
+        self.tweens.animating.add(obj)
+
+    def shift_rows(self, count: int):
+        # called when the shared arrays drop their first ``count`` rows
+        self.rows = [row - count for row in self.rows]
+        self._rows = None
+
+    def _row_index(self):
+        # a slice when our rows are contiguous, which they usually are, since
+        # only the newest step of a sequence is added to
+        rows = self.rows
+        if rows[-1] - rows[0] + 1 == len(rows):
+            return slice(rows[0], rows[-1] + 1)
+        return np.array(rows, dtype=np.intp)
 
     def _update_easing_data(self, delta_time: float):
-        finished = []
-        for start, obj, attr, data in self.easing_data:
-            if start > self.elapsed_time:
-                continue
-            done, value = easing.ease_update(data, delta_time)
-            setattr(obj, attr, value)
-            if done:
-                # occasionally, we don't line up just right, I assume due to
-                # rounding errors
-                setattr(obj, attr, data.end_value)
-                finished.append((start, obj, attr, data))
-        for item in finished:
-            self.easing_data.remove(item)
+        if not self.pending:
+            return
+        if self._rows is None:
+            self._rows = self._row_index()
+        self.pending -= self.tweens.step(
+            self._rows, self.elapsed_time, delta_time
+        )
 
     def _update_function_data(self, delta_time: float):
-        finished = []
-        for start, obj, func, args, kwargs in self.function_data:
-            if start > self.elapsed_time:
-                continue
+        ready = [
+            item for item in self.function_data if item[0] <= self.elapsed_time
+        ]
+        if not ready:
+            return
+        self.function_data = [
+            item for item in self.function_data if item[0] > self.elapsed_time
+        ]
+        for start, obj, func, args, kwargs in ready:
             if func is not None:
                 getattr(obj, func)(*args, **kwargs)
             else:
                 obj(*args, **kwargs)
-            finished.append((start, obj, func, args, kwargs))
-        for item in finished:
-            self.function_data.remove(item)
+            self.tweens.animating.discard(obj)
 
     def on_update(self, delta_time: float):
         self.elapsed_time += delta_time
@@ -112,6 +434,11 @@ class ParallelEasing:
 
 
 class SequenceEasing(deque[ParallelEasing]):
+    def __init__(self):
+        super().__init__()
+        # every step of the sequence keeps its tweens in the same arrays
+        self.tweens = TweenArrays()
+
     @property
     def finished(self) -> bool:
         return len(self) == 0
@@ -120,25 +447,55 @@ class SequenceEasing(deque[ParallelEasing]):
     def objects(self) -> list[Any]:
         return list(it.chain.from_iterable(x.objects for x in self))
 
+    @property
+    def active(self) -> int:
+        # tweens still running or waiting for their turn
+        return sum(x.pending for x in self)
+
+    def is_animating(self, obj: Any) -> bool:
+        return obj in self.tweens.animating
+
+    def on_finished(self, obj: Any, callback: Callable[[Any], None]):
+        self.tweens.animating.on_finished(obj, callback)
+
+    def finish(self):
+        # play out everything that is queued right away, in order, as if all
+        # the time in the world had passed
+        while not self.on_update(math.inf):
+            pass
+
     def series(self) -> ParallelEasing:
-        rv = ParallelEasing()
+        rv = ParallelEasing(tweens=self.tweens)
         self.append(rv)
         return rv
 
     def parallel(self) -> ParallelEasing:
         return self[-1]
 
+    def _compact(self):
+        # rows belonging to steps that have already finished are dropped once
+        # they make up most of the arrays
+        if not self:
+            self.tweens.drop(len(self.tweens))
+            return
+        first = min((x.rows[0] for x in self if x.rows), default=None)
+        if first is None:
+            first = len(self.tweens)
+        if first and 2 * first >= len(self.tweens):
+            self.tweens.drop(first)
+            for parallel in self:
+                parallel.shift_rows(first)
+
     def on_update(self, delta_time: float) -> bool:
         if self.finished:
             return True
-        finished = []
-        for i, parallel in enumerate(self):
+        while self:
+            parallel = self[0]
             parallel.on_update(delta_time)
             if not parallel.finished:
                 break
-            finished.append(parallel)
-        for item in finished:
-            self.remove(item)
+            self.popleft()
+        self._compact()
         if self.finished:
             return True
         return False
@@ -1,136 +1,480 @@
+import argparse
+from contextlib import nullcontext
+from typing import Optional, Sequence
+
 import arcade
 import numpy as np
 
-from blackjack import SCREEN_SIZE, SCREEN_TITLE
+from blackjack import (
+    CARD_SIZE,
+    SCREEN_SIZE,
+    SCREEN_TITLE,
+    SEAT_PADDING,
+    textures,
+)
+from blackjack.count import CountTracker
 from blackjack.deck import Card, Deck
-from blackjack.seat import Dealer, Player
-from blackjack.textures import TABLE
+from blackjack.engine import Table
+from blackjack.history import HistoryWriter
+from blackjack.instrument import (
+    PROFILE,
+    PROFILE_DUMP,
+    DrawCalls,
+    FrameProfiler,
+)
+from blackjack.policy import MimicDealer, Policy, RandomPolicy
+from blackjack.seat import Dealer, Placemats, Player, layout_seats
+from blackjack.strategy import BasicStrategy
+from blackjack.utilities import FrameCache, Label, LabelPool
+
+FRAME_RATE = 1 / 60
+# once nothing has changed on screen for IDLE_FRAMES frames in a row, the
+# window updates and draws at IDLE_RATE until there is input or something
+# starts moving again
+IDLE_RATE = 1 / 4
+IDLE_FRAMES = 30
 
 
 class BlackJack(arcade.Window):
-    def __init__(self, num_players: int):
+    def __init__(
+        self,
+        num_players: int,
+        num_decks: int = 1,
+        autoplay: bool = False,
+        turbo: bool = False,
+        rounds_per_frame: int = 1,
+        render: bool = True,
+        bots: Optional[Sequence[Optional[Policy]]] = None,
+        seed: Optional[int] = None,
+        history: Optional[str] = None,
+        profile: bool = False,
+        profile_dump: Optional[str] = None,
+    ):
         super().__init__(
             width=SCREEN_SIZE[0],
             height=SCREEN_SIZE[1],
             title=SCREEN_TITLE,
             fullscreen=False,
             resizable=True,
+            update_rate=FRAME_RATE,
+            draw_rate=FRAME_RATE,
         )
         self.background_color = arcade.color.RICH_BLACK
-        self.background_texture = TABLE
-        self.background_scale: float
+        # the table, kept in a sprite list of its own rather than drawn from
+        # its texture, which builds a new sprite list every time
+        self.background = arcade.SpriteList()
+        self.background.append(arcade.Sprite(textures.TABLE))
+        self.placemats = Placemats()
 
         self.num_players = num_players
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        self.table = Table(num_players, seed=seed, num_decks=num_decks)
+        # every round gets written to the hand history, if there is one
+        self.history: Optional[HistoryWriter] = None
+        if history is not None:
+            self.history = HistoryWriter(history, self.table, seed)
+        self.labels = LabelPool()
+        self.num_decks = num_decks
+        self._strategy: Optional[BasicStrategy] = None
+        # the policy playing each seat, or None where a human plays it; with
+        # autoplay on, the basic strategy stands in for the humans
+        self.bots = list(bots) if bots else [None] * num_players
+        if len(self.bots) != num_players:
+            raise ValueError("bots must have one policy per player")
+        self.autoplay = autoplay
+        self.show_hints = True
+        # turbo skips the animations; when bots play every seat on top of it,
+        # whole rounds are played out within a single frame
+        self.turbo = turbo
+        self.rounds_per_frame = rounds_per_frame
+        self.render = render
+        # frame timings, kept and shown only when asked for
+        self.profiler: Optional[FrameProfiler] = None
+        if profile:
+            self.profiler = FrameProfiler(
+                num_players + 1, dump_path=profile_dump
+            )
+            self.profiler.gauge("tweens", lambda: self.deck.easing_data.active)
+            self.profiler.counter("texts", lambda: Label.created)
+            DrawCalls.install()
+            self.profiler.counter("draw_calls", DrawCalls.read)
+            self.table.shoe.on_shuffle.append(self.profiler.on_shuffle)
+        self.show_profile = profile
 
         self.deck: Deck
         self.dealer: Dealer
         self.players: list[Player] = []
+        # the latest size the window was resized to, until the table is laid
+        # out for it
+        self.resized: Optional[tuple[int, int]] = None
+        # a frame in which nothing changed is drawn once more into the cache,
+        # which is then shown for as long as nothing changes
+        self.frame = FrameCache(self)
+        self.drawn: Optional[tuple] = None
+        self.clean_frames = 0
+        self.idle = False
+
+    @property
+    def player_idx(self) -> int:
+        return self.table.player_idx
+
+    @property
+    def round_over(self) -> bool:
+        return self.table.round_over
+
+    @property
+    def unattended(self) -> bool:
+        return all(self.bot(i) is not None for i in range(self.num_players))
 
-        self.player_idx: int = 0
-        self.round_over = False
+    @property
+    def strategy(self) -> BasicStrategy:
+        # only built once the hints or autoplay first need it
+        if self._strategy is None:
+            self._strategy = BasicStrategy(self.num_decks)
+        return self._strategy
+
+    def bot(self, i: int) -> Optional[Policy]:
+        if self.bots[i] is None and self.autoplay:
+            return self.strategy
+        return self.bots[i]
 
     def setup(self, new_deck: bool = False):
         width, height = self.get_size()
         if new_deck:
-            self.deck = Deck(width, height, "red")
-        self.dealer = Dealer(width, height, center_x=width / 2, top=height)
-        players = []
-        for i in range(self.num_players):
-            if self.players:
-                kwargs = {"purse": self.players[i].purse}
-            else:
-                kwargs = {}
-            players.append(
+            self.deck = Deck(
+                width,
+                height,
+                "red",
+                self.table.shoe,
+                instant=self.turbo,
+                tracker=CountTracker(self.table.shoe),
+                profiler=self.profiler,
+            )
+            self.dealer = Dealer(
+                width,
+                height,
+                labels=self.labels,
+                slot="dealer",
+                center_x=width / 2,
+                top=height,
+            )
+            self.players = [
                 Player(
                     width,
                     height,
+                    hand,
+                    labels=self.labels,
+                    slot=("player", i),
                     center_x=width * (i + 0.5) / self.num_players,
                     bottom=0,
-                    **kwargs,
                 )
-            )
-        self.players = players
-        self.player_idx = 0
-        self.round_over = False
-        self.on_resize(width, height)
+                for i, hand in enumerate(self.table.players)
+            ]
+            self.layout(width, height)
+        else:
+            # the seats are kept from one round to the next, only their cards
+            # are thrown away
+            self.deck.discard(self.players + [self.dealer])
+
+        # shuffle between rounds, before the pile is brought back up to size
+        with self.timed("shuffle_ms"):
+            self.table.shuffle_if_needed()
+        self.deck.refill()
 
-        for seat in self.players + [self.dealer] + self.players:
-            self.deck.deal_card(seat)
-        self.deck.deal_card(self.dealer, flip=False)
+        seats = {id(p.hand): p for p in self.players}
+        seats[id(self.table.dealer)] = self.dealer
+        dealt = self.table.new_round()
+        for i, (hand, card) in enumerate(dealt):
+            # the dealer's hole card is dealt face down
+            flip = i < len(dealt) - 1
+            self.deck.deal_card(seats[id(hand)], card, flip=flip)
 
     def on_resize(self, width, height):
         super().on_resize(width, height)
+        # dragging the window sends a burst of these, so the table is only
+        # laid out once, before whatever comes next of an update or a draw
+        self.resized = (width, height)
+        self.wake()
 
-        self.background_scale = max(
-            np.array([width, height]) / self.background_texture.size
+    def apply_resize(self):
+        if self.resized is not None:
+            self.layout(*self.resized)
+
+    def layout(self, width: int, height: int):
+        self.resized = None
+        self.drawn = None
+        background = self.background[0]
+        background.scale = max(
+            np.array([width, height]) / background.texture.size
         )
+        background.position = width / 2, height / 2
         self.deck.on_resize(width, height)
-        self.dealer.on_resize(width, height)
-        for p in self.players:
-            p.on_resize(width, height)
+        seats = self.players + [self.dealer]
+        layout_seats(seats, width, height)
+        self.placemats.build(seats, self.player_idx)
+
+    def timed(self, field: str, index: Optional[int] = None):
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.timed(field, index)
 
     def on_update(self, delta_time: float = 1 / 60):
+        if self.profiler is not None:
+            self.profiler.next_frame()
+        with self.timed("update_ms"):
+            self.apply_resize()
+            self.update_table(delta_time)
+
+    def update_table(self, delta_time: float):
         if not self.deck.easing_data.on_update(delta_time):
             return
+        if self.turbo and self.unattended:
+            for _ in range(self.rounds_per_frame):
+                if self.round_over:
+                    self.setup()
+                while not self.round_over:
+                    self.step()
+            return
+        if self.round_over:
+            return
+        self.step()
 
-        # go through players in order
-        while self.players and self.player_idx < self.num_players:
-            player = self.players[self.player_idx]
-            if player.purse <= 0:
-                self.player_idx += 1
-                continue
-            player.resolve_bet()
-            if not player.bet_resolved and player.value_total < 21:
-                break
-            self.player_idx += 1
-
-        # once we are done with the players, it is the dealer's turn, and then
-        # we can resolve any remaining bets
-        if self.player_idx >= self.num_players:
+    def step(self):
+        # the engine walks through the players in order; once it reaches the
+        # dealer we reveal the hole card before any more cards are drawn
+        card = self.table.advance()
+        if self.round_over and self.history is not None:
+            self.history.record()
+        if self.table.dealer_turn:
             hole_card: Card = self.dealer[1]
             if (
                 hole_card.texture == hole_card.back_texture
-                and hole_card not in self.deck.easing_data.objects
+                and not self.deck.easing_data.is_animating(hole_card)
             ):
-                hole_card.easing_swap_texture(self.deck.easing_data)
-            if self.dealer.will_stay():
-                dealer_total = self.dealer.value_total
-                for player in self.players:
-                    player.resolve_bet(dealer_total)
-                self.round_over = True
-            else:
-                self.deck.deal_card(self.dealer)
+                self.deck.flip_card(hole_card)
+        if card is not None:
+            self.deck.deal_card(self.dealer, card)
+        elif not self.table.dealer_turn:
+            self.play_bot()
+
+    def play_bot(self):
+        bot = self.bot(self.player_idx)
+        if bot is None:
+            return
+        if bot(self.table.current_player, self.table.upcard):
+            self.deck.deal_card(
+                self.players[self.player_idx], self.table.hit()
+            )
+        else:
+            self.table.stand()
+
+    def hint(self) -> str:
+        player = self.table.current_player
+        if not self.show_hints or player is None or player.bet_resolved:
+            return ""
+        return self.strategy.hint(player.value, self.table.upcard)
+
+    def count(self) -> str:
+        tracker = self.deck.tracker
+        if not self.show_hints or tracker is None:
+            return ""
+        return f"RC {tracker.running_count:+d}  TC {tracker.true_count:+.1f}"
+
+    def snapshot(self) -> tuple:
+        # everything on screen that can change while no tween is running
+        tracker = self.deck.tracker
+        overlay = self.profiler.overlay if self.profiler is not None else []
+        return (
+            self.get_size(),
+            self.player_idx,
+            self.show_hints,
+            self.show_profile and tuple(overlay),
+            len(self.deck),
+            len(self.deck.pile),
+            tuple(len(seat) for seat in self.players + [self.dealer]),
+            tuple(
+                (p.purse, p.bet, p.bet_resolved) for p in self.table.players
+            ),
+            tracker and (tracker.running_count, tracker.unseen),
+        )
+
+    def set_idle(self, idle: bool):
+        if idle == self.idle:
+            return
+        self.idle = idle
+        rate = IDLE_RATE if idle else FRAME_RATE
+        self.set_update_rate(rate)
+        self.set_draw_rate(rate)
+
+    def wake(self):
+        self.clean_frames = 0
+        self.set_idle(False)
 
     def on_draw(self):
+        if not self.render:
+            return
+        with self.timed("draw_ms"):
+            self.apply_resize()
+            state = self.snapshot()
+            if state != self.drawn or not self.deck.easing_data.finished:
+                # still changing, so straight to the screen
+                self.drawn = state
+                self.frame.invalidate()
+                self.draw_table()
+                self.wake()
+                return
+            if self.frame.stale:
+                with self.frame.redraw():
+                    self.draw_table()
+            self.frame.present()
+            self.clean_frames += 1
+            if self.clean_frames >= IDLE_FRAMES:
+                self.set_idle(True)
+
+    def draw_table(self):
+        # a draw call each for the table, the placemats, the cards and the
+        # labels, however many seats there are
         width, height = self.get_size()
-        self.background_texture.draw_scaled(
-            width / 2, height / 2, self.background_scale
-        )
+        self.background.draw()
+        self.placemats.highlight(self.player_idx)
+        self.placemats.draw()
         self.deck.on_draw()
-        for i, seat in enumerate(self.players + [self.dealer]):
-            if i == self.player_idx:
-                seat.on_draw(highlight=True)
-            else:
-                seat.on_draw(highlight=False)
+        for i, seat in enumerate(self.players):
+            with self.timed("seat_ms", i):
+                seat.on_draw(hint=self.hint() if i == self.player_idx else "")
+        with self.timed("seat_ms", self.num_players):
+            self.dealer.on_draw()
+        self.labels["count"].update(
+            self.count(),
+            start_x=self.deck.anchor[0] + self.deck.scale * CARD_SIZE[0] / 2,
+            start_y=self.deck.anchor[1]
+            - self.deck.scale * (CARD_SIZE[1] + SEAT_PADDING),
+            color=arcade.color.YELLOW,
+        )
+        if self.profiler is not None:
+            self.draw_profile(width, height)
+        self.labels.draw()
+
+    def draw_profile(self, width: int, height: int):
+        lines = self.profiler.overlay if self.show_profile else []
+        for i in range(5):
+            self.labels["profile", i].update(
+                lines[i] if i < len(lines) else "",
+                start_x=width - 200 * self.deck.scale,
+                start_y=height - (SEAT_PADDING + 24 * i) * self.deck.scale,
+                color=arcade.color.YELLOW,
+            )
+
+    def close_history(self):
+        if self.history is not None:
+            self.history.close()
+        if self.profiler is not None and self.profiler.dump_path:
+            self.profiler.dump()
+
+    def on_close(self):
+        self.close_history()
+        super().on_close()
+
+    def on_mouse_press(self, x, y, button, modifiers):
+        self.wake()
 
     def on_key_press(self, symbol, modifier):
+        self.wake()
         if symbol == arcade.key.Q:
+            self.close_history()
             exit(0)
+        if symbol == arcade.key.A:
+            self.autoplay = not self.autoplay
+            return
+        if symbol == arcade.key.H:
+            self.show_hints = not self.show_hints
+            return
+        if symbol == arcade.key.T:
+            self.turbo = self.deck.instant = not self.turbo
+            return
+        if symbol == arcade.key.P:
+            self.show_profile = not self.show_profile
+            return
 
         # any key will start a new round
         if self.round_over:
             self.setup()
             return
 
-        # handle the players turn
+        # handle the players turn, unless a bot is playing it
+        if self.table.dealer_turn or self.bot(self.player_idx) is not None:
+            return
         player = self.players[self.player_idx]
         if symbol == arcade.key.SPACE:
-            self.deck.deal_card(player)
+            self.deck.deal_card(player, self.table.hit())
         elif symbol == arcade.key.ENTER:
-            self.player_idx += 1
+            self.table.stand()
+
+
+def make_bot(name: str, num_decks: int = 1) -> Optional[Policy]:
+    if name == "human":
+        return None
+    if name == "dealer":
+        return MimicDealer()
+    if name == "basic":
+        return BasicStrategy(num_decks)
+    if name == "random":
+        return RandomPolicy()
+    raise ValueError(f"unknown bot {name!r}")
 
 
 if __name__ == "__main__":
-    window = BlackJack(num_players=1)
+    parser = argparse.ArgumentParser(description=SCREEN_TITLE)
+    parser.add_argument("--players", type=int, default=1)
+    parser.add_argument("--decks", type=int, default=1)
+    parser.add_argument("--autoplay", action="store_true")
+    parser.add_argument(
+        "--bots",
+        help="comma separated policy per seat: human, dealer, basic or random",
+    )
+    parser.add_argument(
+        "--turbo", action="store_true", help="skip all card animations"
+    )
+    parser.add_argument(
+        "--rounds-per-frame",
+        type=int,
+        default=1,
+        help="rounds to play each frame in turbo autoplay",
+    )
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--history", help="file to record every round to")
+    parser.add_argument(
+        "--no-render", dest="render", action="store_false", help="never draw"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        default=PROFILE,
+        help="time every frame and show the timings (P toggles them)",
+    )
+    parser.add_argument(
+        "--profile-dump",
+        default=PROFILE_DUMP,
+        help=".json or .csv file to write the frame timings to",
+    )
+    args = parser.parse_args()
+    bots = None
+    if args.bots:
+        bots = [make_bot(name, args.decks) for name in args.bots.split(",")]
+
+    window = BlackJack(
+        num_players=args.players,
+        num_decks=args.decks,
+        autoplay=args.autoplay,
+        turbo=args.turbo,
+        rounds_per_frame=args.rounds_per_frame,
+        render=args.render,
+        bots=bots,
+        seed=args.seed,
+        history=args.history,
+        profile=args.profile or args.profile_dump is not None,
+        profile_dump=args.profile_dump,
+    )
     window.setup(new_deck=True)
     arcade.run()
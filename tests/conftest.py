@@ -0,0 +1,8 @@
+import os
+import sys
+import tempfile
+
+# the tests never open a window, and never touch the user's cache
+os.environ.setdefault("ARCADE_HEADLESS", "1")
+os.environ.setdefault("BLACKJACK_CACHE", tempfile.mkdtemp(prefix="blackjack"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
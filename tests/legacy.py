@@ -0,0 +1,168 @@
+import itertools as it
+from collections import deque
+from typing import Any, Optional, Sequence
+
+from arcade import easing
+
+# The scoring and easing of the game as they were before the rules moved
+# into ``engine`` and the tweens into NumPy arrays, kept as they were to check
+# the new code against. ``Seat`` and ``Player`` have been boiled down to
+# functions of their card values.
+
+
+def value_total(values: Sequence[int]) -> int:
+    total = 0
+    aces = 0
+    for value in values:
+        if value == 1:
+            aces += 1
+        elif value >= 10:
+            total += 10
+        else:
+            total += value
+    if aces == 0:
+        return total
+    tmp = 11 + aces - 1
+    if tmp + total <= 21:
+        return tmp + total
+    return aces + total
+
+
+def resolve_bet(
+    values: Sequence[int], bet: int, dealer_total: Optional[int] = None
+) -> tuple[int, Optional[str]]:
+    # the change in the purse, and the result
+    value = value_total(values)
+
+    # Black Jack is an auto-win condition
+    if value == 21 and len(values) == 2:
+        return int(1.5 * bet), "W"
+    # Bust is an auto lose condition
+    if value > 21:
+        return -bet, "L"
+    # any other condition requires knowledge of the dealer's score
+    if dealer_total is None:
+        return 0, None
+
+    # we know the player hasn't busted, so...
+    if dealer_total > 21:
+        # the dealer busted, player wins
+        return bet, "W"
+    elif dealer_total > value:
+        # the dealer has a higher score
+        return -bet, "L"
+    elif value > dealer_total:
+        # the player has a higher score
+        return bet, "W"
+    else:
+        # tie, aka "push"
+        return 0, "T"
+
+
+class ParallelEasing:
+    def __init__(self, start_time: float = 0.0):
+        self.start_time = start_time
+        self.elapsed_time = 0.0
+        self.easing_data: deque[tuple[float, Any, str, easing.EasingData]] = (
+            deque([])
+        )
+        self.function_data: deque[tuple[float, Any, str, tuple, dict]] = deque(
+            []
+        )
+
+    @property
+    def finished(self):
+        return len(self.easing_data) == 0 and len(self.function_data) == 0
+
+    @property
+    def objects(self):
+        return [
+            item[1] for item in it.chain(self.easing_data, self.function_data)
+        ]
+
+    def add_easing_data(
+        self,
+        obj: Any,
+        attribute: str,
+        easing_data: easing.EasingData,
+        delay: float = 0.0,
+    ):
+        self.easing_data.append(
+            (self.start_time + delay, obj, attribute, easing_data)
+        )
+
+    def add_function_data(
+        self,
+        obj: Any,
+        function_name: str,
+        args: tuple,
+        kwargs: dict,
+        delay: float = 0.0,
+    ):
+        self.function_data.append(
+            (self.start_time + delay, obj, function_name, args, kwargs)
+        )
+
+    def _update_easing_data(self, delta_time: float):
+        finished = []
+        for start, obj, attr, data in self.easing_data:
+            if start > self.elapsed_time:
+                continue
+            done, value = easing.ease_update(data, delta_time)
+            setattr(obj, attr, value)
+            if done:
+                setattr(obj, attr, data.end_value)
+                finished.append((start, obj, attr, data))
+        for item in finished:
+            self.easing_data.remove(item)
+
+    def _update_function_data(self, delta_time: float):
+        finished = []
+        for start, obj, func, args, kwargs in self.function_data:
+            if start > self.elapsed_time:
+                continue
+            if func is not None:
+                getattr(obj, func)(*args, **kwargs)
+            else:
+                obj(*args, **kwargs)
+            finished.append((start, obj, func, args, kwargs))
+        for item in finished:
+            self.function_data.remove(item)
+
+    def on_update(self, delta_time: float):
+        self.elapsed_time += delta_time
+        self._update_easing_data(delta_time)
+        self._update_function_data(delta_time)
+
+
+class SequenceEasing(deque[ParallelEasing]):
+    @property
+    def finished(self) -> bool:
+        return len(self) == 0
+
+    @property
+    def objects(self) -> list[Any]:
+        return list(it.chain.from_iterable(x.objects for x in self))
+
+    def series(self) -> ParallelEasing:
+        rv = ParallelEasing()
+        self.append(rv)
+        return rv
+
+    def parallel(self) -> ParallelEasing:
+        return self[-1]
+
+    def on_update(self, delta_time: float) -> bool:
+        if self.finished:
+            return True
+        finished = []
+        for i, parallel in enumerate(self):
+            parallel.on_update(delta_time)
+            if not parallel.finished:
+                break
+            finished.append(parallel)
+        for item in finished:
+            self.remove(item)
+        if self.finished:
+            return True
+        return False
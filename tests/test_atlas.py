@@ -0,0 +1,24 @@
+import numpy as np
+
+from blackjack import CARD_SIZE, atlas
+from blackjack.textures import CARD_BACKS, CARD_FACES, AtlasTextures
+
+
+def test_packed_at_the_drawn_size(tmp_path):
+    image, index, _ = atlas.load_atlas(str(tmp_path))
+    assert sorted(index) == atlas.card_assets()
+    for left, top, width, height in index.values():
+        assert np.allclose((width, height), CARD_SIZE, atol=0.5)
+        assert left + width <= image.width and top + height <= image.height
+
+    # and read back from the cache just the same
+    cached, cached_index, _ = atlas.load_atlas(str(tmp_path))
+    assert cached_index == index
+    assert cached.size == image.size
+
+
+def test_atlas_is_released_once_cropped():
+    textures = [*CARD_BACKS.values(), *CARD_FACES.values()]
+    assert AtlasTextures._atlas is None
+    for texture in textures:
+        assert np.allclose(texture.size, CARD_SIZE, atol=0.5)
@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+from blackjack.bankroll import (
+    CountBet,
+    FlatBet,
+    ProportionalBet,
+    Shoes,
+    simulate_bankrolls,
+)
+from blackjack.count import HI_LO
+from blackjack.engine import CARDS
+
+
+def test_flat_bet():
+    purses = np.array([50, 1000])
+    assert FlatBet(25)(purses, np.zeros(2)).tolist() == [25, 25]
+
+
+def test_proportional_bet():
+    bets = ProportionalBet(0.1, minimum=5)(np.array([20, 1000, 1234]), None)
+    assert bets.tolist() == [5, 100, 123]
+    with pytest.raises(ValueError):
+        ProportionalBet(0.0)
+
+
+def test_count_bet():
+    counts = np.array([-3.0, 0.5, 1.9, 2.0, 4.5, 30.0])
+    bets = CountBet(unit=10, max_units=8)(np.zeros(6, np.int64), counts)
+    assert bets.tolist() == [10, 10, 10, 20, 40, 80]
+
+
+def test_shoes_count_what_they_deal():
+    shoes = Shoes(4, num_decks=2, rng=np.random.default_rng(1))
+    rows = np.arange(4)
+    dealt = [shoes.draw(rows) for _ in range(60)]
+    ranks = np.stack(dealt, axis=1)
+    tags = np.array(HI_LO)[ranks - 1].sum(axis=1)
+    assert shoes.running_count.tolist() == tags.tolist()
+    remaining = 2 * len(CARDS) - 60
+    assert shoes.true_counts(rows) == pytest.approx(
+        tags / (remaining / len(CARDS))
+    )
+    # every shoe holds two decks, each in an order of its own
+    for row in shoes.order:
+        assert np.bincount(row, minlength=14)[1:].tolist() == [8] * 13
+    assert len({row.tobytes() for row in shoes.order}) == 4
+
+
+def test_shoes_shuffle_at_the_cut():
+    shoes = Shoes(3, penetration=0.5, rng=np.random.default_rng(2))
+    for _ in range(26):
+        shoes.draw(np.array([0, 1]))
+    shoes.shuffle_if_needed()
+    assert shoes.position.tolist() == [0, 0, 0]
+    assert shoes.running_count[:2].tolist() == [0, 0]
+
+
+def test_bets_are_capped_and_ruin_is_final():
+    results = simulate_bankrolls(
+        2000, 500, purse=250, betting=FlatBet(100), seed=3
+    )
+    ruined = results.ruined
+    assert ruined.any() and not ruined.all()
+    # the last bet is never more than what was left
+    assert (results.purses[ruined] == 0).all()
+    assert (results.purses[~ruined] > 0).all()
+    assert (results.ruin_rounds[ruined] >= 1).all()
+    assert (results.peaks >= np.maximum(results.purses, 250)).all()
+    assert (results.max_drawdowns >= results.peaks - results.purses).all()
+    assert results.ruin_probability == pytest.approx(ruined.mean())
+    assert len(results.time_to_ruin()) == ruined.sum()
+    quantiles = results.drawdown_quantiles()
+    assert quantiles[0.5] <= quantiles[0.9] <= quantiles[0.99]
+
+
+def test_seeded():
+    kwargs = dict(betting=CountBet(), num_decks=6, seed=4)
+    first = simulate_bankrolls(300, 200, **kwargs)
+    second = simulate_bankrolls(300, 200, **kwargs)
+    assert np.array_equal(first.purses, second.purses)
+    assert np.array_equal(first.ruin_rounds, second.ruin_rounds)
+
+
+def test_counting_needs_a_shoe():
+    with pytest.raises(ValueError):
+        simulate_bankrolls(10, 10, betting=CountBet())
+
+
+def test_proportional_betting_is_safer():
+    flat = simulate_bankrolls(
+        3000, 300, purse=1000, betting=FlatBet(100), seed=5
+    )
+    proportional = simulate_bankrolls(
+        3000,
+        300,
+        purse=1000,
+        betting=ProportionalBet(0.1, minimum=1),
+        seed=5,
+    )
+    assert proportional.ruin_probability < flat.ruin_probability
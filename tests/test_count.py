@@ -0,0 +1,60 @@
+import pytest
+
+from blackjack.count import HI_LO, CountTracker
+from blackjack.engine import CARDS, Shoe, Table
+from blackjack.probability import shoe_composition
+
+
+def test_follows_the_shoe():
+    shoe = Shoe(num_decks=2, penetration=1.0, seed=8)
+    tracker = CountTracker(shoe)
+    running = 0
+    for _ in range(70):
+        card = shoe.draw()
+        tracker.observe(card)
+        running += HI_LO[card[1] - 1]
+        assert tracker.running_count == running
+        assert tracker.unseen == len(shoe)
+        assert tracker.ranks == shoe.composition().tolist()
+    assert tracker.composition() == shoe_composition(shoe)
+    assert tracker.decks_remaining == pytest.approx(len(shoe) / len(CARDS))
+    assert tracker.true_count == pytest.approx(
+        running / tracker.decks_remaining
+    )
+
+
+def test_a_full_deck_counts_to_zero():
+    shoe = Shoe(penetration=1.0, seed=1)
+    tracker = CountTracker(shoe)
+    for _ in range(len(CARDS)):
+        tracker.observe(shoe.draw())
+    assert tracker.running_count == 0
+    assert tracker.unseen == 0
+    # an empty shoe counts as half a deck
+    assert tracker.true_count == 0
+
+
+def test_resets_on_shuffle():
+    shoe = Shoe(num_decks=6, seed=2)
+    tracker = CountTracker(shoe)
+    for _ in range(40):
+        tracker.observe(shoe.draw())
+    shoe.shuffle()
+    assert tracker.running_count == 0
+    assert tracker.unseen == 6 * len(CARDS)
+    assert tracker.ranks == [24] * 13
+
+
+def test_table_counts_the_hole_card_once_seen():
+    table = Table(2, seed=6, num_decks=1, penetration=1.0)
+    table.tracker = tracker = CountTracker(table.shoe)
+    for _ in range(8):
+        table.new_round()
+        # everything but the hole card is out in the open
+        assert tracker.unseen == len(table.shoe) + 1
+        while not table.round_over:
+            if table.advance() is None and not table.round_over:
+                table.stand()
+        assert table.hole_card_seen
+        assert tracker.unseen == len(table.shoe)
+        assert tracker.ranks == table.shoe.composition().tolist()
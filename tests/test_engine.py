@@ -0,0 +1,136 @@
+import itertools as it
+
+import numpy as np
+import pytest
+
+from blackjack.engine import (
+    CARDS,
+    VALUES,
+    DealerHand,
+    Hand,
+    PlayerHand,
+    Shoe,
+    Table,
+)
+
+from . import legacy
+
+
+def hands(max_cards: int = 4):
+    # every multiset of card values up to ``max_cards`` cards
+    for size in range(1, max_cards + 1):
+        yield from it.combinations_with_replacement(VALUES, size)
+
+
+def make_hand(values, hand=None) -> Hand:
+    hand = Hand() if hand is None else hand
+    for i, value in enumerate(values):
+        hand.add((CARDS[i % 4 * len(VALUES)][0], value))
+    return hand
+
+
+def test_total_matches_value_total():
+    for values in hands():
+        hand = make_hand(values)
+        assert hand.total == legacy.value_total(values), values
+        assert hand.value.total == hand.total
+        assert hand.busted == (hand.total > 21)
+
+
+def test_soft_hands():
+    assert make_hand([1, 6]).soft
+    assert not make_hand([1, 6, 10]).soft
+    assert make_hand([1, 1, 9]).total == 21
+    assert make_hand([1, 1, 9]).soft
+    assert not make_hand([10, 7]).soft
+
+
+@pytest.mark.parametrize("dealer_total", [None, 17, 18, 19, 20, 21, 22, 26])
+def test_resolve_bet_matches_legacy(dealer_total):
+    for values in hands():
+        player = make_hand(values, PlayerHand(purse=1000, bet=30))
+        player.resolve_bet(dealer_total)
+        delta, result = legacy.resolve_bet(values, 30, dealer_total)
+        assert (player.purse - 1000, player.bet_resolved) == (delta, result)
+
+
+def test_resolve_bet_only_once():
+    player = make_hand([10, 9], PlayerHand(purse=1000, bet=100))
+    player.resolve_bet(17)
+    player.resolve_bet(20)
+    assert (player.purse, player.bet_resolved) == (1100, "W")
+
+
+def test_dealer_stands_on_17():
+    assert not make_hand([10, 6], DealerHand()).will_stay()
+    assert make_hand([10, 7], DealerHand()).will_stay()
+    assert make_hand([1, 6], DealerHand()).will_stay()
+
+
+def test_shoe_deals_every_card_once():
+    shoe = Shoe(num_decks=2, penetration=1.0, seed=3)
+    dealt = [shoe.draw() for _ in range(len(shoe))]
+    assert sorted(dealt) == sorted(CARDS * 2)
+    assert shoe.needs_shuffle
+    assert shoe.composition().sum() == 0
+
+
+def test_shoe_is_seeded():
+    first, second = Shoe(seed=5), Shoe(seed=5)
+    assert [first.draw() for _ in range(20)] == [
+        second.draw() for _ in range(20)
+    ]
+
+
+def test_shoe_cut_card():
+    shoe = Shoe(num_decks=6, penetration=0.75, seed=1)
+    shuffles = []
+    shoe.on_shuffle.append(lambda: shuffles.append(len(shoe)))
+    for _ in range(shoe.cut - 1):
+        shoe.draw()
+    table_shuffle = shoe.needs_shuffle
+    shoe.draw()
+    assert not table_shuffle and shoe.needs_shuffle
+    assert shoe.composition().sum() == 6 * len(CARDS) - shoe.cut
+    # only the table shuffles at the cut card, between rounds
+    assert shuffles == []
+
+
+def test_shoe_shuffles_when_empty():
+    shoe = Shoe(penetration=1.0, seed=2)
+    for _ in range(len(CARDS)):
+        shoe.draw()
+    shoe.draw()
+    assert len(shoe) == len(CARDS) - 1
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"num_decks": 0}, {"num_decks": 9}, {"penetration": 0}]
+)
+def test_shoe_rejects(kwargs):
+    with pytest.raises(ValueError):
+        Shoe(**kwargs)
+
+
+def test_play_round_settles_like_legacy():
+    table = Table(3, purse=10**6, seed=11)
+    for _ in range(500):
+        purses = [player.purse for player in table.players]
+        results = table.play_round()
+        dealer_total = table.dealer.total
+        assert table.dealer.will_stay()
+        for player, purse, result in zip(table.players, purses, results):
+            values = [value for _, value in player.cards]
+            delta, expected = legacy.resolve_bet(values, 100, dealer_total)
+            assert (player.purse - purse, result) == (delta, expected)
+
+
+def test_broke_players_sit_out():
+    table = Table(2, purse=0, seed=1)
+    table.players[1].purse = 1000
+    table.new_round()
+    while not table.round_over:
+        if table.advance() is None and not table.round_over:
+            assert table.player_idx == 1
+            table.stand()
+    assert np.all([len(player) == 2 for player in table.players])
@@ -0,0 +1,88 @@
+import arcade
+import pytest
+
+from blackjack.count import CountTracker
+
+main = pytest.importorskip("main")
+
+
+@pytest.fixture(scope="module")
+def window():
+    # one window for the whole module, as arcade keeps a single one around
+    window = main.BlackJack(1, seed=4)
+    yield window
+    window.close()
+
+
+def settle(window, frames: int = 1000):
+    for _ in range(frames):
+        window.on_update(1 / 60)
+        if window.deck.easing_data.finished:
+            return
+    raise AssertionError("the animations never finished")
+
+
+def stand_until_over(window, frames: int = 1000):
+    # the player stands whenever it is their turn, until the round is over
+    for _ in range(frames):
+        if window.round_over:
+            return
+        if not window.table.dealer_turn:
+            window.on_key_press(arcade.key.ENTER, 0)
+        window.on_update(1 / 60)
+    raise AssertionError("the round never ended")
+
+
+def expected_count(window) -> CountTracker:
+    # what the tracker should say: every card turned face up this shoe
+    tracker = CountTracker(window.table.shoe)
+    table = window.table
+    for hand in table.players + [table.dealer]:
+        for i, card in enumerate(hand.cards):
+            if hand is table.dealer and i == 1 and not table.hole_card_seen:
+                continue
+            tracker.observe(card)
+    return tracker
+
+
+def test_new_round_during_the_hole_card_flip(window):
+    window.setup(new_deck=True)
+    for _ in range(200):
+        # stand, and let the dealer play until the round ends mid-flip
+        stand_until_over(window)
+        hole_card = window.dealer[1]
+        if window.deck.easing_data.is_animating(hole_card):
+            break
+        settle(window)
+        window.on_key_press(arcade.key.SPACE, 0)
+    else:
+        pytest.skip("the round never ended with the hole card still flipping")
+
+    # the next round starts from a reshuffled shoe
+    window.table.shoe.position = window.table.shoe.cut
+    window.on_key_press(arcade.key.SPACE, 0)
+    settle(window)
+    expected = expected_count(window)
+    tracker = window.deck.tracker
+    assert tracker.unseen == expected.unseen
+    assert tracker.ranks == expected.ranks
+    assert tracker.running_count == expected.running_count
+
+
+def test_cards_are_recycled(window):
+    window.setup(new_deck=True)
+    deck = window.deck
+    cards = set(deck)
+    for _ in range(30):
+        stand_until_over(window)
+        # straight into the next round, whatever is still moving
+        window.on_key_press(arcade.key.SPACE, 0)
+        # no sprite is ever thrown away
+        assert cards <= set(deck) | set(deck.spare)
+        cards = set(deck) | set(deck.spare)
+    settle(window)
+    seated = sum(len(seat) for seat in window.players + [window.dealer])
+    assert len(deck) == len(deck.pile) + seated
+    assert len(deck) + len(deck.spare) <= 2 * 52
+    assert all(card.code == -1 for card in deck.pile)
+    assert all(card not in deck for card in deck.spare)
@@ -0,0 +1,131 @@
+import numpy as np
+import pytest
+
+from blackjack.engine import CARD_INDEX, CARDS, Table
+from blackjack.history import (
+    NO_CARD,
+    HistoryReader,
+    HistoryWriter,
+    decode_card,
+    encode_card,
+)
+from blackjack.policy import RandomPolicy
+
+
+def play(path, rounds: int = 300, seed: int = 21, buffer_rounds: int = 64):
+    table = Table(3, seed=seed, num_decks=2)
+    policy = RandomPolicy(0.4, seed=seed)
+    played = []
+    with HistoryWriter(path, table, seed, buffer_rounds) as writer:
+        for _ in range(rounds):
+            table.play_round(policy)
+            writer.record()
+            played.append(
+                (
+                    [list(hand.cards) for hand in table.players],
+                    list(table.dealer.cards),
+                    [player.bet_resolved for player in table.players],
+                    [player.purse for player in table.players],
+                )
+            )
+    return played
+
+
+def test_write_and_read(tmp_path):
+    path = tmp_path / "hands.bin"
+    played = play(str(path))
+    reader = HistoryReader(str(path))
+    assert len(reader) == len(played)
+    assert reader.seed == 21
+    assert reader.num_players == 3
+    assert reader.records["round"].tolist() == list(range(len(played)))
+    for record, (players, dealer, results, purses) in zip(
+        reader.records, played
+    ):
+        assert record["purses"].tolist() == purses
+        assert [x.decode() for x in record["results"]] == results
+    hits = reader.hits()
+    assert hits.tolist() == [
+        [max(len(cards) - 2, 0) for cards in players] for players, *_ in played
+    ]
+    counts = reader.outcome_counts()
+    for i in range(3):
+        assert sum(counts[code][i] for code in counts) == len(played)
+
+
+def test_deal_order(tmp_path):
+    path = tmp_path / "hands.bin"
+    played = play(str(path), rounds=20)
+    reader = HistoryReader(str(path))
+    players, dealer, *_ = played[0]
+    order = reader.deal_order(0)
+    assert order[:4] == [hand[0] for hand in players] + [dealer[0]]
+    assert order[4:8] == [hand[1] for hand in players] + [dealer[1]]
+    assert sorted(order) == sorted(sum(players, []) + dealer)
+
+
+def test_replay(tmp_path):
+    path = tmp_path / "hands.bin"
+    played = play(str(path))
+    reader = HistoryReader(str(path))
+    replayed = 0
+    for table, (players, dealer, results, purses) in zip(
+        reader.replay(), played
+    ):
+        assert [hand.cards for hand in table.players] == players
+        assert table.dealer.cards == dealer
+        assert [player.purse for player in table.players] == purses
+        replayed += 1
+    assert replayed == len(played)
+
+
+def test_replay_catches_tampering(tmp_path):
+    path = tmp_path / "hands.bin"
+    play(str(path), rounds=10)
+    records = HistoryReader(str(path)).records
+    offset = records.offset + records.dtype.itemsize * 5
+    data = bytearray(path.read_bytes())
+    cards = offset + records.dtype.fields["cards"][1]
+    data[cards] = data[cards] % 52 + 1
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="round 5"):
+        list(HistoryReader(str(path)).replay())
+
+
+def test_empty_history(tmp_path):
+    path = tmp_path / "hands.bin"
+    play(str(path), rounds=0)
+    reader = HistoryReader(str(path))
+    assert len(reader) == 0
+    assert list(reader.replay()) == []
+
+
+def test_never_overwrites(tmp_path):
+    path = tmp_path / "hands.bin"
+    play(str(path), rounds=5)
+    before = path.read_bytes()
+    with pytest.raises(FileExistsError):
+        play(str(path), rounds=5)
+    assert path.read_bytes() == before
+
+
+@pytest.mark.parametrize("seed", [None, -1, 1 << 128, "7"])
+def test_bad_seed(tmp_path, seed):
+    path = tmp_path / "hands.bin"
+    with pytest.raises(ValueError):
+        HistoryWriter(str(path), Table(1), seed)
+    assert not path.exists()
+
+
+def test_not_a_history(tmp_path):
+    path = tmp_path / "hands.bin"
+    path.write_bytes(np.arange(100, dtype=np.uint8).tobytes())
+    with pytest.raises(ValueError):
+        HistoryReader(str(path))
+
+
+def test_card_codes():
+    codes = [encode_card(card) for card in CARDS]
+    assert codes == [CARD_INDEX[card] + 1 for card in CARDS]
+    assert NO_CARD not in codes and max(codes) < 256
+    assert [decode_card(code) for code in codes] == list(CARDS)
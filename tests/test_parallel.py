@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from blackjack.parallel import run_simulation
+
+
+def check_workers(policy):
+    kwargs = dict(seed=9, policy=policy, chunk_size=5000, purse=0)
+    serial = run_simulation(20000, workers=1, **kwargs)
+    parallel = run_simulation(20000, workers=2, **kwargs)
+    assert serial.net == parallel.net
+    assert serial.wins == parallel.wins
+    assert np.array_equal(serial.purse, parallel.purse)
+
+
+def test_does_not_depend_on_workers():
+    check_workers(None)
+
+
+def test_purse_trajectory():
+    summary = run_simulation(12000, seed=1, chunk_size=5000, purse=1000)
+    assert summary.rounds == len(summary.purse) == 12000
+    assert summary.purse[-1] == 1000 + summary.net
+
+
+@pytest.mark.parametrize("seed", [None, 3])
+def test_counts_add_up(seed):
+    summary = run_simulation(7000, seed=seed, chunk_size=3000, workers=1)
+    assert summary.wins + summary.losses + summary.pushes == 7000
+    assert summary.purse is None
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from blackjack.engine import Hand, HandValue
+from blackjack.policy import MimicDealer, Policy, RandomPolicy, TablePolicy
+from blackjack.simulate import POLICY_SHAPE, dealer_policy
+
+from .test_parallel import check_workers
+from .test_simulate import check_play_round
+
+
+def test_policy_needs_decide():
+    class Incomplete(Policy):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_table_policy_shape():
+    with pytest.raises(ValueError):
+        TablePolicy(np.zeros((2, 3), dtype=bool))
+
+
+def test_single_hands_match_batches():
+    policy = TablePolicy(np.random.default_rng(0).random(POLICY_SHAPE) < 0.5)
+    values = [
+        HandValue(hard, aces)
+        for hard in range(2, 22)
+        for aces in (0, 1)
+        if hard >= aces
+    ]
+    for upcard in range(1, 14):
+        batch = policy.decide(
+            np.array([value.soft for value in values]),
+            np.array([value.total for value in values]),
+            np.full(len(values), min(upcard, 10)),
+        )
+        single = [policy.should_hit(value, upcard) for value in values]
+        assert batch.tolist() == single
+
+
+def test_decide_hands():
+    hands = []
+    for cards in [[("S", 10), ("H", 6)], [("S", 1), ("H", 10)]]:
+        hand = Hand()
+        for card in cards:
+            hand.add(card)
+        hands.append(hand)
+    assert MimicDealer().decide_hands(hands, [10, 10]).tolist() == [
+        True,
+        False,
+    ]
+
+
+def test_never_hits_21():
+    for policy in [RandomPolicy(1.0), TablePolicy(np.ones(POLICY_SHAPE))]:
+        assert not policy.should_hit(HandValue(11, 1), 5)
+        assert not policy.decide(
+            np.array([True]), np.array([21]), np.array([5])
+        )[0]
+
+
+def test_mimic_dealer():
+    assert np.array_equal(MimicDealer().table, dealer_policy())
+    check_play_round(MimicDealer())
+
+
+def test_random_policy():
+    with pytest.raises(ValueError):
+        RandomPolicy(1.5)
+    first, second = RandomPolicy(0.5, seed=1), RandomPolicy(0.5, seed=1)
+    totals = np.full(1000, 12)
+    hits = first.decide(None, totals, None)
+    assert np.array_equal(hits, second.decide(None, totals, None))
+    assert 400 < hits.sum() < 600
+    assert not RandomPolicy(0.0).decide(None, totals, None).any()
+
+
+def test_seeded():
+    mimic = MimicDealer()
+    assert mimic.seeded(np.random.SeedSequence(1)) is mimic
+    policy = RandomPolicy(0.3, seed=5)
+    copy = policy.seeded(np.random.SeedSequence(1))
+    assert copy is not policy and copy.hit_probability == 0.3
+    again = policy.seeded(np.random.SeedSequence(1))
+    totals = np.full(100, 12)
+    assert np.array_equal(
+        copy.decide(None, totals, None), again.decide(None, totals, None)
+    )
+
+
+def test_random_policy_does_not_depend_on_workers():
+    check_workers(RandomPolicy(0.3, seed=1))
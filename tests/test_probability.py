@@ -0,0 +1,87 @@
+import itertools as it
+import math
+
+import numpy as np
+import pytest
+
+from blackjack.engine import DEALER_STANDS_ON, HandValue
+from blackjack.probability import (
+    BUST,
+    FINAL_TOTALS,
+    FULL_DECK,
+    _distribution,
+    dealer_bust_probability,
+    dealer_distribution,
+    full_shoe,
+)
+
+
+def brute_force(upcard: int, composition) -> np.ndarray:
+    # play the dealer's hand out for every order the shoe could be in
+    cards = [
+        points
+        for points, count in enumerate(composition, start=1)
+        for _ in range(count)
+    ]
+    result = np.zeros(BUST + 1)
+    orders = 0
+    for order in it.permutations(cards):
+        value = HandValue(upcard, int(upcard == 1))
+        for points in order:
+            value = HandValue(
+                value.hard_total + points, value.aces + (points == 1)
+            )
+            if value.total >= DEALER_STANDS_ON:
+                break
+        else:
+            raise AssertionError("the shoe ran out")
+        if value.total > 21:
+            result[BUST] += 1
+        else:
+            result[FINAL_TOTALS.index(value.total)] += 1
+        orders += 1
+    return result / orders
+
+
+@pytest.mark.parametrize(
+    "upcard, composition",
+    [
+        (6, (2, 1, 0, 0, 1, 0, 0, 0, 0, 4)),
+        (1, (1, 0, 1, 0, 0, 1, 0, 1, 1, 3)),
+        (10, (0, 2, 1, 1, 0, 1, 1, 0, 0, 2)),
+        (2, (0, 0, 0, 0, 1, 1, 1, 0, 1, 4)),
+    ],
+)
+def test_matches_brute_force(upcard, composition):
+    assert dealer_distribution(upcard, composition) == pytest.approx(
+        brute_force(upcard, composition)
+    )
+
+
+@pytest.mark.parametrize("upcard", range(1, 11))
+@pytest.mark.parametrize("num_decks", [1, 6])
+def test_adds_up(upcard, num_decks):
+    distribution = dealer_distribution(upcard, full_shoe(num_decks))
+    assert math.isclose(distribution.sum(), 1.0)
+    assert (distribution >= 0).all()
+
+
+def test_full_shoe():
+    assert full_shoe() == FULL_DECK
+    assert sum(full_shoe(6)) == 6 * 52
+
+
+@pytest.mark.parametrize("num_decks", [1, 6, 8])
+def test_empty_shoe_carries_on_with_a_fresh_one(num_decks):
+    # the last card left is a 2, after which the shoe gets shuffled
+    composition = (0, 1) + (0,) * 8
+    after = dealer_distribution(10, composition, num_decks)
+    fresh = _distribution(12, False, full_shoe(num_decks), num_decks)
+    assert after == pytest.approx(np.array(fresh))
+
+
+def test_empty_shoe_depends_on_decks():
+    composition = (0, 1) + (0,) * 8
+    one = dealer_bust_probability(10, composition, 1)
+    six = dealer_bust_probability(10, composition, 6)
+    assert one != six
@@ -0,0 +1,139 @@
+import asyncio
+
+import pytest
+
+from blackjack.policy import MimicDealer
+from blackjack.server import GameServer, TableHost
+
+
+async def listen(server: GameServer):
+    listener = await server.serve(port=0)
+    return listener, listener.sockets[0].getsockname()[1]
+
+
+async def ask(port: int, line: str) -> str:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"{line}\n".encode())
+    await writer.drain()
+    reply = await asyncio.wait_for(reader.readline(), 5)
+    writer.close()
+    return reply.decode().strip()
+
+
+@pytest.mark.parametrize(
+    "join", ["JOIN 0 -1", "JOIN 0 2", "JOIN 0 1", "JOIN 7 0", "HELLO", ""]
+)
+def test_bad_join(join):
+    async def main():
+        server = GameServer()
+        server.add_table(2, bots=[None, MimicDealer()])
+        listener, port = await listen(server)
+        try:
+            reply = await ask(port, join)
+        finally:
+            listener.close()
+        assert reply.startswith("ERROR")
+        assert server.tables[0].connections == [None, None]
+
+    asyncio.run(main())
+
+
+def test_connect_checks_the_seat():
+    host = TableHost(0, 2, bots=[None, MimicDealer()])
+    for seat in [-1, 1, 2]:
+        with pytest.raises(ValueError):
+            host.connect(seat)
+    host.connect(0)
+    with pytest.raises(ValueError):
+        host.connect(0)
+
+
+def test_round_trip():
+    async def main():
+        server = GameServer()
+        host = server.add_table(1, seed=3, tick=0)
+        listener, port = await listen(server)
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"JOIN 0 0\n")
+        await writer.drain()
+        while host.connections[0] is None:
+            await asyncio.sleep(0.01)
+
+        tables = asyncio.create_task(server.run(2))
+        events = []
+        while True:
+            line = await asyncio.wait_for(reader.readline(), 5)
+            event = line.decode().split()
+            events.append(event)
+            if event[0] == "TURN":
+                # hit on the first turn of every round, then stand, with
+                # and without the number of the turn
+                if events[-2][0] != "DEAL":
+                    action = "hit"
+                else:
+                    action = f"STAND {event[-1]}"
+                writer.write(f"{action}\n".encode())
+                await writer.drain()
+            if sum(e[0] == "RESULT" for e in events) == 2:
+                break
+        await asyncio.wait_for(tables, 5)
+        writer.close()
+        listener.close()
+
+        assert [e for e in events if e[0] == "ROUND"] == [
+            ["ROUND", "0"],
+            ["ROUND", "1"],
+        ]
+        results = [e for e in events if e[0] == "RESULT"]
+        assert len(results) == 2
+        assert all(e[2] in "WLT-" for e in results)
+        assert int(results[-1][3]) == host.table.players[0].purse
+        # the hits came back as cards for seat 0
+        dealt = [e for e in events if e[0] == "DEAL"]
+        assert len(dealt) >= 4
+        assert all(e[1] == "0" for e in dealt)
+
+    asyncio.run(main())
+
+
+def test_disconnect_does_not_hold_up_the_table():
+    async def main():
+        host = TableHost(0, 2, seed=1, tick=0)
+        host.connect(0, queue_size=4)
+        task = asyncio.create_task(host.run(5))
+        await asyncio.sleep(0.05)
+        host.disconnect(0)
+        await asyncio.wait_for(task, 5)
+        assert host.rounds == 5
+
+    asyncio.run(main())
+
+
+def test_late_actions_are_dropped():
+    async def main():
+        host = TableHost(0, 1, seed=1, tick=0, action_timeout=0.05)
+        connection = host.connect(0)
+        task = asyncio.create_task(host.run(3))
+        events = []
+        turns = 0
+        while not task.done() or not connection.events.empty():
+            try:
+                event = await asyncio.wait_for(connection.next_event(), 1)
+            except asyncio.TimeoutError:
+                break
+            events.append(event)
+            if event[0] == "TURN":
+                turns += 1
+                if turns == 1:
+                    # answered only after the turn has timed out, by when
+                    # the next one may well be waiting
+                    await asyncio.sleep(0.1)
+                    await connection.hit(event[-1])
+                else:
+                    await connection.stand(event[-1])
+        await task
+        # the late hit was not taken as an answer to a later turn
+        dealt = [e for e in events if e[0] == "DEAL" and e[1] == 0]
+        assert len(dealt) == 2 * 3
+
+    asyncio.run(main())
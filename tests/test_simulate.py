@@ -0,0 +1,49 @@
+from collections import deque
+
+import numpy as np
+
+from blackjack.engine import Table
+from blackjack.simulate import OUTCOME_CODES, simulate_rounds
+
+
+def deal_order(table: Table) -> list[int]:
+    # the values of a one-player round in the order the engine dealt them
+    player = [value for _, value in table.players[0].cards]
+    dealer = [value for _, value in table.dealer.cards]
+    return (
+        player[:1]
+        + dealer[:1]
+        + player[1:2]
+        + dealer[1:2]
+        + (player[2:] + dealer[2:])
+    )
+
+
+def check_play_round(policy):
+    # deal every simulated round the cards the engine dealt for it
+    table = Table(1, purse=10**9, seed=2)
+    rounds = 2000
+    expected, deltas, orders = [], [], []
+    for _ in range(rounds):
+        purse = table.players[0].purse
+        expected.extend(table.play_round(policy))
+        deltas.append(table.players[0].purse - purse)
+        orders.append(deque(deal_order(table)))
+
+    def draw(rows: np.ndarray) -> np.ndarray:
+        return np.array([orders[row].popleft() for row in rows], np.int8)
+
+    results = simulate_rounds(rounds, policy=policy, draw=draw)
+    assert [OUTCOME_CODES[x] for x in results.outcomes.tolist()] == expected
+    assert results.deltas.tolist() == deltas
+    assert all(not order for order in orders)
+
+
+def test_matches_play_round():
+    check_play_round(None)
+
+
+def test_seeded():
+    first = simulate_rounds(1000, rng=np.random.default_rng(4))
+    second = simulate_rounds(1000, rng=np.random.default_rng(4))
+    assert np.array_equal(first.deltas, second.deltas)
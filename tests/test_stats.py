@@ -0,0 +1,95 @@
+import math
+
+import numpy as np
+import pytest
+
+from blackjack.engine import Table
+from blackjack.parallel import run_simulation
+from blackjack.simulate import LOSS, PUSH, WIN, simulate_rounds
+from blackjack.stats import RESULT_CODES, RunningStats
+
+
+def test_add_matches_numpy():
+    rng = np.random.default_rng(1)
+    deltas = rng.integers(-100, 151, 500)
+    stats = RunningStats()
+    for delta in deltas.tolist():
+        stats.add(delta, WIN if delta > 0 else LOSS, delta == 150, False)
+    assert stats.count == 500
+    assert stats.net == deltas.sum()
+    assert stats.mean == pytest.approx(deltas.mean())
+    assert stats.variance == pytest.approx(deltas.var(ddof=1))
+    assert stats.stderr == pytest.approx(deltas.std(ddof=1) / math.sqrt(500))
+    assert stats.blackjacks == np.count_nonzero(deltas == 150)
+
+
+def test_merge_matches_one_pass():
+    results = simulate_rounds(10000, rng=np.random.default_rng(2))
+    whole = RunningStats()
+    whole.add_results(results)
+    merged = RunningStats()
+    for start, stop in [(0, 1), (1, 3000), (3000, 3000), (3000, 10000)]:
+        part = RunningStats()
+        part.add_results(
+            type(results)(*(column[start:stop] for column in results))
+        )
+        merged.merge(part)
+    for field in ["count", "net", "wins", "losses", "pushes", "blackjacks"]:
+        assert getattr(merged, field) == getattr(whole, field)
+    assert merged.dealer_busts == whole.dealer_busts
+    assert merged.mean == pytest.approx(whole.mean)
+    assert merged.variance == pytest.approx(whole.variance)
+    assert whole.mean == pytest.approx(results.deltas.mean())
+    assert whole.wins == np.count_nonzero(results.outcomes == WIN)
+
+
+def test_empty():
+    stats = RunningStats()
+    assert stats.variance == math.inf
+    assert math.isnan(stats.win_rate)
+    assert stats.merge(RunningStats()).count == 0
+
+
+def test_confidence_interval():
+    stats = RunningStats()
+    stats.add_results(simulate_rounds(1000, rng=np.random.default_rng(3)))
+    low, high = stats.confidence_interval(0.95)
+    assert low < stats.mean < high
+    assert high - low == pytest.approx(2 * 1.959964 * stats.stderr)
+    assert stats.half_width(0.99) > stats.half_width(0.95)
+
+
+def test_add_table_leaves_out_broke_seats():
+    table = Table(3, seed=4)
+    stats = RunningStats()
+    count = net = 0
+    for _ in range(50):
+        table.players[1].purse = 0
+        purses = [player.purse for player in table.players]
+        table.play_round()
+        stats.add_table(table, purses)
+        for player, purse in zip(table.players, purses):
+            assert player.bet_resolved in RESULT_CODES
+            if purse > 0:
+                count += 1
+                net += player.purse - purse
+    assert count <= 2 * 50
+    assert (stats.count, stats.net) == (count, net)
+    assert stats.wins + stats.losses + stats.pushes == count
+
+
+def test_stops_early():
+    kwargs = dict(seed=5, chunk_size=2000, ci_width=20.0)
+    serial = run_simulation(10**6, workers=1, **kwargs)
+    parallel = run_simulation(10**6, workers=2, **kwargs)
+    assert serial.rounds < 10**6
+    assert serial.rounds % 2000 == 0
+    assert 2 * serial.stats.half_width() <= 20.0
+    # one chunk fewer would not have been enough
+    shorter = run_simulation(serial.rounds - 2000, seed=5, chunk_size=2000)
+    assert 2 * shorter.stats.half_width() > 20.0
+    assert (parallel.rounds, parallel.net) == (serial.rounds, serial.net)
+
+
+def test_codes():
+    assert RESULT_CODES == {"W": WIN, "T": PUSH, "L": LOSS}
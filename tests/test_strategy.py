@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from blackjack.engine import HandValue
+from blackjack.strategy import (
+    HIT,
+    STAND,
+    TABLE_SHAPE,
+    BasicStrategy,
+    generate,
+    hit_policy,
+    load,
+    table_path,
+)
+
+from .test_simulate import check_play_round
+
+
+@pytest.fixture(scope="module")
+def table():
+    return generate(1)
+
+
+def hits(table, soft: bool, total: int) -> list[bool]:
+    # against a 2 up to a 10, then an ace
+    row = hit_policy(table)[int(soft), total]
+    return row[2:].tolist() + [bool(row[1])]
+
+
+def test_shape(table):
+    assert table.shape == TABLE_SHAPE
+    assert np.isfinite(table[0, 4:, 1:]).all()
+    assert (np.abs(table) <= 1.5).all()
+
+
+def test_basic_strategy(table):
+    assert all(hits(table, False, 11))
+    assert not any(hits(table, False, 17))
+    assert hits(table, False, 16) == [False] * 5 + [True] * 5
+    assert hits(table, False, 12) == [True] * 2 + [False] * 3 + [True] * 5
+    assert all(hits(table, True, 17))
+    assert hits(table, True, 18) == [False] * 7 + [True] * 3
+
+
+def test_standing_on_21_wins_money(table):
+    assert (table[:, 21, 1:, STAND] > 0).all()
+    assert (table[:, 21, 1:, STAND] >= table[:, 21, 1:, HIT]).all()
+
+
+def test_load_caches(tmp_path):
+    path = table_path(2, str(tmp_path))
+    first = load(2, str(tmp_path))
+    assert isinstance(first, np.memmap)
+    assert path.endswith("2deck.npy")
+    modified = tmp_path.stat().st_mtime_ns
+    second = load(2, str(tmp_path))
+    assert np.array_equal(first, second)
+    assert tmp_path.stat().st_mtime_ns == modified
+
+
+def test_load_without_a_writable_cache(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_bytes(b"")
+    table = load(1, str(blocker / "cache"))
+    assert np.array_equal(table, generate(1))
+
+
+def test_load_regenerates_a_corrupt_table(tmp_path):
+    path = table_path(1, str(tmp_path))
+    with open(path, "wb") as f:
+        f.write(b"not a table")
+    assert np.array_equal(load(1, str(tmp_path)), generate(1))
+
+
+def test_hint(table):
+    strategy = BasicStrategy(ev=table)
+    assert strategy.hint(HandValue(16, 0), 10).startswith("HIT")
+    assert strategy.hint(HandValue(20, 0), 10).startswith("STAND")
+    assert strategy.hint(HandValue(11, 1), 10) == ""
+
+
+def test_simulates_like_play_round(table):
+    check_play_round(BasicStrategy(ev=table))
@@ -0,0 +1,156 @@
+import random
+
+import pytest
+from arcade import easing
+
+from blackjack import utilities
+
+from . import legacy
+
+EASE_FUNCTIONS = [
+    easing.linear,
+    easing.smoothstep,
+    easing.ease_in,
+    easing.ease_out,
+    easing.ease_in_out,
+    easing.ease_out_elastic,
+    easing.ease_out_bounce,
+    easing.ease_in_back,
+    easing.ease_out_back,
+    easing.ease_in_sin,
+    easing.ease_out_sin,
+    easing.ease_in_out_sin,
+    lambda percent: percent**3,  # not one of arcade's
+]
+
+
+class Target:
+    def __init__(self, name: str, calls: list):
+        self.name = name
+        self.calls = calls
+        self.x = 0.0
+        self.y = 0.0
+
+    def poke(self, tag):
+        self.calls.append((self.name, tag))
+
+
+def schedule(rng: random.Random):
+    # steps of tweens and calls, as (kind, target, ...) tuples
+    steps = []
+    for _ in range(rng.randint(1, 6)):
+        step = []
+        for _ in range(rng.randint(1, 8)):
+            target = rng.randrange(4)
+            delay = rng.choice([0.0, 0.0, 0.05, 0.2])
+            if rng.random() < 0.25:
+                step.append(("call", target, delay, rng.random()))
+            else:
+                step.append(
+                    (
+                        "tween",
+                        target,
+                        delay,
+                        rng.choice("xy"),
+                        rng.uniform(-500, 500),
+                        rng.uniform(-500, 500),
+                        rng.choice([0.0, 0.1, 0.25, 0.5, 1.0]),
+                        rng.choice(EASE_FUNCTIONS),
+                    )
+                )
+        steps.append(step)
+    return steps
+
+
+def build(sequence, steps, targets):
+    for step in steps:
+        parallel = sequence.series()
+        for kind, target, delay, *args in step:
+            if kind == "call":
+                parallel.add_function_data(
+                    targets[target], "poke", (args[0],), {}, delay=delay
+                )
+                continue
+            attribute, start, end, duration, ease = args
+            parallel.add_easing_data(
+                targets[target],
+                attribute,
+                easing.ease_value(
+                    start, end, time=duration, ease_function=ease
+                ),
+                delay=delay,
+            )
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_matches_legacy(seed):
+    rng = random.Random(seed)
+    old_calls, new_calls = [], []
+    old_targets = [Target(i, old_calls) for i in range(4)]
+    new_targets = [Target(i, new_calls) for i in range(4)]
+    old, new = legacy.SequenceEasing(), utilities.SequenceEasing()
+    steps = schedule(rng)
+    build(old, steps, old_targets)
+    build(new, steps, new_targets)
+
+    for frame in range(2000):
+        if frame < 120 and rng.random() < 0.02:
+            # more work queued in the middle of the animation
+            steps = schedule(rng)
+            build(old, steps, old_targets)
+            build(new, steps, new_targets)
+        delta_time = rng.choice([1 / 60, 1 / 30, 0.003])
+        assert old.on_update(delta_time) == new.on_update(delta_time)
+        for before, after in zip(old_targets, new_targets):
+            assert after.x == pytest.approx(before.x, abs=1e-9)
+            assert after.y == pytest.approx(before.y, abs=1e-9)
+        assert new_calls == old_calls
+        assert len(new) == len(old)
+        assert sorted(x.name for x in new.objects) == sorted(
+            x.name for x in old.objects
+        )
+        if old.finished:
+            break
+    assert new.finished and old.finished
+
+
+def test_is_animating_and_on_finished():
+    sequence = utilities.SequenceEasing()
+    moving, idle = Target("moving", []), Target("idle", [])
+    sequence.series().add_easing_data(
+        moving, "x", easing.ease_value(0, 10, time=0.1)
+    )
+    sequence.series().add_function_data(moving, "poke", ("done",), {})
+    finished = []
+    sequence.on_finished(moving, finished.append)
+    sequence.on_finished(idle, finished.append)
+    assert finished == [idle]
+    assert sequence.is_animating(moving)
+    assert not sequence.is_animating(idle)
+
+    while not sequence.on_update(1 / 60):
+        pass
+    assert finished == [idle, moving]
+    assert moving.calls == [("moving", "done")]
+    assert not sequence.is_animating(moving)
+    assert moving.x == 10
+
+
+def test_finish():
+    sequence = utilities.SequenceEasing()
+    target = Target("target", [])
+    sequence.series().add_easing_data(
+        target, "x", easing.ease_value(0, 10, time=1.0)
+    )
+    sequence.parallel().add_function_data(
+        target, "poke", ("late",), {}, delay=5.0
+    )
+    sequence.series().add_easing_data(
+        target, "y", easing.ease_value(3, -4, time=0.5)
+    )
+    sequence.on_update(1 / 60)
+    sequence.finish()
+    assert sequence.finished
+    assert (target.x, target.y) == (10, -4)
+    assert target.calls == [("target", "late")]
+    assert not sequence.is_animating(target)